@@ -6,7 +6,7 @@ import logging
 import threading
 import time
 from dataclasses import dataclass
-from enum import Enum
+from enum import IntEnum
 from typing import TYPE_CHECKING, Any, ClassVar
 
 from rich import box
@@ -34,8 +34,13 @@ setup_logging()
 logger = logging.getLogger(__name__)
 
 
-class Mode(Enum):
-    """Application mode Enum."""
+class Mode(IntEnum):
+    """
+    Application mode Enum.
+
+    An IntEnum so the per-frame lookups keyed by mode hash as plain ints
+    rather than through Enum's Python-level ``__hash__``.
+    """
 
     IDLE = 0
     LATENCY = 1
@@ -280,10 +285,11 @@ class ApplicationManager:
         self, command: int, decoded_data: bytes, byte_string: bytes
     ) -> None:
         """Dispatch incoming messages to the active module."""
-        module = self.modules.get(self.mode)
+        mode = self.mode
+        module = self.modules.get(mode)
         if not module:
             return
-        cfg = self.module_configs_by_mode.get(self.mode)
+        cfg = self.module_configs_by_mode.get(mode)
         if cfg and cfg.handler:
             cfg.handler(module, command, decoded_data, byte_string)
 
@@ -2,16 +2,25 @@
 
 from __future__ import annotations
 
+import functools
 import json
 import logging
+import os
+import queue
+import struct
+import textwrap
 import threading
 import time
 import uuid
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Self
 
 import numpy as np
 
-from result_format import FORMAT_LATENCY_SERIES, make_result_envelope
+from result_format import (
+    FORMAT_LATENCY_SERIES,
+    make_result_envelope,
+    write_text_atomic,
+)
 from serial_interface import SerialCommand, SerialInterface
 from ui_console import console
 
@@ -27,6 +36,30 @@ STATISTICS_HEADER_BYTES = bytes([0x00, 0x37])
 TASK_HEADER_BYTES = bytes([0x00, 0x38])
 STATUS_REQUEST_SPACING_S = 0.02
 STATUS_REQUEST_TIMEOUT_S = 2.0
+ECHO_WAIT_POLL_S = 0.01
+
+# Status response layouts, unpacked from offset 3 (after id/command/length):
+# item index followed by big-endian 32-bit fields.
+STATUS_PAYLOAD_OFFSET = 3
+STATISTICS_RESPONSE = struct.Struct(">BI")
+TASK_RESPONSE = struct.Struct(">BIII")
+
+# Echo frames carry a big-endian 16-bit counter after id/command/length.
+ECHO_COUNTER_OFFSET = 3
+ECHO_COUNTER = struct.Struct(">H")
+ECHO_FRAME_MIN_LENGTH = ECHO_COUNTER_OFFSET + ECHO_COUNTER.size
+# Compared on every received frame; resolve the enum values once.
+_ECHO_COMMAND = SerialCommand.ECHO_COMMAND.value
+_STATISTICS_STATUS_COMMAND = SerialCommand.STATISTICS_STATUS_COMMAND.value
+_TASK_STATUS_COMMAND = SerialCommand.TASK_STATUS_COMMAND.value
+
+# Send timestamps are kept in perf_counter_ns() units.
+NS_PER_S = 1_000_000_000
+
+# Wire size of an echo frame: COBS adds ~2 bytes overhead plus the delimiter,
+# and 8N1 encoding means 10 bits per byte on the wire.
+FRAME_OVERHEAD_BYTES = 4
+BITS_PER_WIRE_BYTE = 10
 
 STATISTICS_ITEMS = {
     0: "queue_send_error",
@@ -161,6 +194,111 @@ TASK_DISPLAY_NAMES: dict[str, str] = {
 logger = logging.getLogger(__name__)
 
 
+@functools.cache
+def status_request_payload(header: bytes, index: int) -> bytes:
+    """Return the request frame for one status item, built once per item."""
+    return header + bytes([0x01, index])
+
+
+def uart_drain_time_s(message_length: int, baudrate: float) -> float:
+    """Return the time one echo frame of ``message_length`` takes on the wire."""
+    return (message_length + FRAME_OVERHEAD_BYTES) * BITS_PER_WIRE_BYTE / baudrate
+
+
+# Sentinel asking ResultStream's writer to stop without publishing the file.
+_DISCARD = object()
+
+
+class ResultStream:
+    """
+    Write a result file one record at a time from a background thread.
+
+    Each record is serialised and flushed to a sibling ``.tmp`` file as soon
+    as it is appended, so the encoding overlaps the next burst. ``close``
+    fsyncs the finished file and renames it onto ``file_path``, which is
+    identical to the one ``BaseTest._write_output_to_file`` writes for the
+    same records. ``file_path`` only ever exists complete: if the run is
+    interrupted (an exception leaving the ``with`` block, or the process
+    being killed), the flushed records survive only in the unterminated
+    ``.tmp`` file, and if writing fails no result file is left at all.
+    """
+
+    def __init__(
+        self, file_path: Path, format_type: str = FORMAT_LATENCY_SERIES
+    ) -> None:
+        """Open the stream and start its writer thread."""
+        self.file_path = file_path
+        self._tmp_path = file_path.with_name(file_path.name + ".tmp")
+        self._format_type = format_type
+        # Records, then either None (publish) or _DISCARD (leave unpublished).
+        self._queue: queue.SimpleQueue[object] = queue.SimpleQueue()
+        self._writer_thread = threading.Thread(target=self._write_records, daemon=True)
+        self._writer_thread.start()
+
+    def __enter__(self) -> Self:
+        """Return the stream for use in a ``with`` block."""
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, *_: object) -> None:
+        """Publish the file, or leave it unpublished if the run was interrupted."""
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+    def append(self, record: dict[str, Any]) -> None:
+        """Queue one record for writing."""
+        self._queue.put(record)
+
+    def close(self) -> None:
+        """Finish the file, wait for pending records and publish it."""
+        self._queue.put(None)
+        self._writer_thread.join()
+
+    def discard(self) -> None:
+        """Stop writing and leave the records only in the unterminated ``.tmp``."""
+        self._queue.put(_DISCARD)
+        self._writer_thread.join()
+
+    def _write_records(self) -> None:
+        """Write queued records until a ``None`` or ``_DISCARD`` sentinel."""
+        # Split an empty envelope around its payload list, so the streamed
+        # file keeps the layout of json.dumps(envelope, indent=4).
+        head, tail = json.dumps(
+            make_result_envelope(self._format_type, []), indent=4
+        ).split("[]")
+        finished = False
+        try:
+            with self._tmp_path.open("w", encoding="utf-8") as output_file:
+                output_file.write(head + "[")
+                separator = "\n"
+                while isinstance(record := self._queue.get(), dict):
+                    content = textwrap.indent(json.dumps(record, indent=4), " " * 8)
+                    output_file.write(separator + content)
+                    output_file.flush()
+                    separator = ",\n"
+                finished = True
+                if record is None:
+                    output_file.write(("]" if separator == "\n" else "\n    ]") + tail)
+                    output_file.flush()
+                    os.fsync(output_file.fileno())
+            if record is None:
+                self._tmp_path.replace(self.file_path)
+                logger.info("Test results written to %s", self.file_path)
+            else:
+                logger.warning(
+                    "Run interrupted, partial results left in %s", self._tmp_path
+                )
+        except Exception:
+            # Also covers records json cannot serialise: the thread must not
+            # die silently and leave close() waiting or a truncated file.
+            logger.exception("Error writing to file.")
+            self._tmp_path.unlink(missing_ok=True)
+            # Keep draining so close() does not wait on a dead writer.
+            while not finished and isinstance(self._queue.get(), dict):
+                pass
+
+
 class BaseTest:
     """Base class with shared serial communication and status tracking."""
 
@@ -169,13 +307,12 @@ class BaseTest:
         self.logger = logger
         self.ser = ser
         self._run_id: str = uuid.uuid4().hex[:8]
-        self.latency_msg_sent: dict[int, float] = {}
+        self.latency_msg_sent: dict[int, int] = {}
         self.latency_msg_received: dict[int, float] = {}
         self._status_lock = threading.Lock()
         self._statistics_values: dict[int, int] = dict.fromkeys(STATISTICS_ITEMS, 0)
-        self._statistics_updated_at: dict[int, float] = dict.fromkeys(
-            STATISTICS_ITEMS, 0.0
-        )
+        # Status response receive times, in perf_counter_ns() like the echoes.
+        self._statistics_updated_at: dict[int, int] = dict.fromkeys(STATISTICS_ITEMS, 0)
         self._task_values: dict[int, dict[str, int]] = {
             idx: {"absolute_time_us": 0, "percent_time": 0, "high_watermark": 0}
             for idx in TASK_ITEMS
@@ -183,59 +320,72 @@ class BaseTest:
         # The idle/system slot (index 9) reports min-ever-free-heap instead of
         # a stack watermark.  We track it in a dedicated field.
         self._min_free_heap_bytes: int = 0
-        self._task_updated_at = dict.fromkeys(TASK_ITEMS, 0.0)
+        self._task_updated_at: dict[int, int] = dict.fromkeys(TASK_ITEMS, 0)
+        # Reused echo payload; only the counter bytes change between sends.
+        self._payload_buf = bytearray()
 
-    def publish(self, iteration_counter: int, message_length: int) -> None:
-        """Send one message with counter for roundtrip measurement."""
-        counter = iteration_counter.to_bytes(2, byteorder="big")
+    @staticmethod
+    def _build_payload(message_length: int) -> bytearray:
+        """Build an echo payload of ``message_length`` bytes with a zero counter."""
         trailer = bytes([0x02] * (message_length - len(HEADER_BYTES) - 3))
         m_length = (len(trailer) + 2).to_bytes(1, byteorder="big")
-        payload = HEADER_BYTES + m_length + counter + trailer
+        return bytearray(HEADER_BYTES + m_length + bytes(2) + trailer)
 
-        self.latency_msg_sent[iteration_counter] = time.perf_counter()
+    def publish(self, iteration_counter: int, message_length: int) -> None:
+        """Send one message with counter for roundtrip measurement."""
+        payload = self._payload_buf
+        if len(payload) != message_length:
+            payload = self._payload_buf = self._build_payload(message_length)
+        ECHO_COUNTER.pack_into(payload, ECHO_COUNTER_OFFSET, iteration_counter)
+
+        self.latency_msg_sent[iteration_counter] = time.perf_counter_ns()
         self.ser.write(payload)
         self.ser.flush()
-        logger.info("Published (encoded) `%s`, counter %s", payload, iteration_counter)
+        logger.debug("Published (encoded) `%s`, counter %s", payload, iteration_counter)
 
     def handle_message(self, command: int, decoded_data: bytes) -> None:
         """Handle return message and store measured latency."""
-        if command == SerialCommand.ECHO_COMMAND.value:
-            try:
-                counter_bytes = [decoded_data[3], decoded_data[4]]
-                counter = int.from_bytes(counter_bytes, byteorder="big")
-                latency = time.perf_counter() - self.latency_msg_sent[counter]
-                self.latency_msg_received[counter] = latency
-                logger.info("Message %d latency: %.5f ms", counter, latency * 1e3)
-            except IndexError:
-                logger.info("Invalid message (Index Error)")
-            except KeyError:
+        if command == _ECHO_COMMAND:
+            # Short and stale echoes are checked up front rather than caught;
+            # stale ones arrive in bursts right after the dicts are cleared.
+            if len(decoded_data) < ECHO_FRAME_MIN_LENGTH:
+                logger.info("Invalid echo message")
+                return
+            (counter,) = ECHO_COUNTER.unpack_from(decoded_data, ECHO_COUNTER_OFFSET)
+            sent_ns = self.latency_msg_sent.get(counter)
+            if sent_ns is None:
                 logger.debug(
                     "Ignoring stale echo response counter=%d (already cleared)",
                     counter,
                 )
-        elif command == SerialCommand.STATISTICS_STATUS_COMMAND.value:
+                return
+            latency = (time.perf_counter_ns() - sent_ns) / NS_PER_S
+            self.latency_msg_received[counter] = latency
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Message %d latency: %.5f ms", counter, latency * 1e3)
+        elif command == _STATISTICS_STATUS_COMMAND:
             try:
-                status_index = decoded_data[3]
-                status_value = int.from_bytes(decoded_data[4:8], byteorder="big")
+                status_index, status_value = STATISTICS_RESPONSE.unpack_from(
+                    decoded_data, STATUS_PAYLOAD_OFFSET
+                )
                 if status_index in self._statistics_values:
-                    now = time.perf_counter()
+                    now = time.perf_counter_ns()
                     with self._status_lock:
                         self._statistics_values[status_index] = status_value
                         self._statistics_updated_at[status_index] = now
-            except IndexError:
+            except struct.error:
                 logger.info("Invalid statistics status message")
-        elif command == SerialCommand.TASK_STATUS_COMMAND.value:
+        elif command == _TASK_STATUS_COMMAND:
             self._handle_task_status(decoded_data)
 
     def _handle_task_status(self, decoded_data: bytes) -> None:
         """Parse and store a TASK_STATUS_COMMAND response."""
         try:
-            status_index = decoded_data[3]
-            abs_time = int.from_bytes(decoded_data[4:8], byteorder="big")
-            perc_time = int.from_bytes(decoded_data[8:12], byteorder="big")
-            field3 = int.from_bytes(decoded_data[12:16], byteorder="big")
+            status_index, abs_time, perc_time, field3 = TASK_RESPONSE.unpack_from(
+                decoded_data, STATUS_PAYLOAD_OFFSET
+            )
             if status_index in self._task_values:
-                now = time.perf_counter()
+                now = time.perf_counter_ns()
                 with self._status_lock:
                     self._task_values[status_index] = {
                         "absolute_time_us": abs_time,
@@ -245,7 +395,7 @@ class BaseTest:
                     self._task_updated_at[status_index] = now
                     if status_index == IDLE_TASK_INDEX:
                         self._min_free_heap_bytes = field3
-        except IndexError:
+        except struct.error:
             logger.info("Invalid task status message")
 
     def _calculate_test_results(
@@ -276,11 +426,23 @@ class BaseTest:
                 "dropped_messages": dropped_messages,
             }
 
-        latencies = list(self.latency_msg_received.values())
-        latency_avg = sum(latencies) / len(latencies)
-        latency_min = min(latencies)
-        latency_max = max(latencies)
-        latency_p95 = np.percentile(latencies, 95)
+        latencies = np.fromiter(
+            self.latency_msg_received.values(),
+            dtype=np.float64,
+            count=len(self.latency_msg_received),
+        )
+        latency_avg = float(latencies.mean())
+        latency_min = float(latencies.min())
+        latency_max = float(latencies.max())
+        # P95 by selection instead of a full sort, interpolated linearly
+        # between the neighbouring order statistics like np.percentile.
+        rank = 0.95 * (latencies.size - 1)
+        lower = int(rank)
+        upper = min(lower + 1, latencies.size - 1)
+        ordered = np.partition(latencies, (lower, upper))
+        latency_p95 = float(
+            ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+        )
 
         logger.info("Average latency: %f ms", latency_avg * 1e3)
         logger.info("Minimum latency: %f ms", latency_min * 1e3)
@@ -301,27 +463,55 @@ class BaseTest:
             "dropped_messages": dropped_messages,
         }
 
+    def _build_iteration_output(  # noqa: PLR0913  # One field per record section
+        self,
+        test_results: dict[str, Any],
+        outstanding_messages: list[int],
+        outstanding_max: int,
+        outstanding_final: int,
+        status_before: dict[str, Any],
+        status_after: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Assemble the JSON record for one burst iteration."""
+        return {
+            **test_results,
+            "results": list(self.latency_msg_received.values()),
+            "outstanding_messages": outstanding_messages,
+            "outstanding_max": outstanding_max,
+            "outstanding_final": outstanding_final,
+            "status_before": status_before,
+            "status_after": status_after,
+            "status_delta": self._calculate_status_delta(status_before, status_after),
+        }
+
     def _write_output_to_file(
         self,
         file_path: Path,
         output_data: list[dict[str, Any]],
     ) -> None:
         """Write test output data to JSON file."""
+        # Serialise in one pass and hand the file a single write; json.dump
+        # would issue one small write per token.
+        content = json.dumps(
+            make_result_envelope(FORMAT_LATENCY_SERIES, output_data), indent=4
+        )
         try:
-            with file_path.open("w", encoding="utf-8") as output_file:
-                json.dump(
-                    make_result_envelope(FORMAT_LATENCY_SERIES, output_data),
-                    output_file,
-                    indent=4,
-                )
-                logger.info("Test results written to %s", file_path)
+            write_text_atomic(file_path, content)
+            logger.info("Test results written to %s", file_path)
         except OSError:
             logger.exception("Error writing to file.")
 
     def _status_update(self, header: bytes, index: int) -> None:
         """Send one status update command."""
-        payload = header + bytes([0x01]) + index.to_bytes(1, byteorder="big")
-        self.ser.write(payload)
+        self.ser.write(status_request_payload(header, index))
+
+    def _wait_for_echoes(self, timeout_s: float) -> None:
+        """Wait until every sent echo has returned, at most ``timeout_s``."""
+        deadline = time.perf_counter() + timeout_s
+        while len(self.latency_msg_received) < len(self.latency_msg_sent):
+            if time.perf_counter() >= deadline:
+                return
+            time.sleep(ECHO_WAIT_POLL_S)
 
     def _request_status_snapshot(
         self, timeout_s: float = STATUS_REQUEST_TIMEOUT_S
@@ -335,7 +525,7 @@ class BaseTest:
                 "complete": False,
             }
 
-        snapshot_marker = time.perf_counter()
+        snapshot_marker = time.perf_counter_ns()
         for index in STATISTICS_ITEMS:
             self._status_update(STATISTICS_HEADER_BYTES, index)
             time.sleep(STATUS_REQUEST_SPACING_S)
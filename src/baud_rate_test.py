@@ -15,6 +15,7 @@ from base_test import (
     DEFAULT_WAIT_TIME,
     MAX_SAMPLE_SIZE,
     BaseTest,
+    uart_drain_time_s,
 )
 from const import TEST_RESULTS_FOLDER
 from logger_config import setup_logging
@@ -60,6 +61,7 @@ class BaudRateTest(BaseTest):
                 self.latency_msg_sent.clear()
                 self.latency_msg_received.clear()
                 outstanding_messages: list[int] = []
+                outstanding_max = 0
                 status_before = self._request_status_snapshot()
 
                 logger.info("Test %d: setting baud rate to %d", j, rate)
@@ -75,21 +77,34 @@ class BaudRateTest(BaseTest):
                 # Allow port to stabilize
                 time.sleep(0.5)
 
-                wire_bytes = length + 4
-                min_uart_delay = (wire_bytes * 10) / rate
+                min_uart_delay = uart_drain_time_s(length, rate)
 
-                burst_init_time = time.perf_counter()
+                # Bind per-sample callables and dicts to locals; the loop runs
+                # at the send rate, so attribute lookups show up as jitter.
+                publish = self.publish
+                sleep = time.sleep
+                clock = time.perf_counter
+                record_outstanding = outstanding_messages.append
+                sent = self.latency_msg_sent
+                received = self.latency_msg_received
+
+                # Pace sends on absolute deadlines so publish time does not
+                # add to the spacing between samples.
+                burst_init_time = deadline = clock()
                 for i in range(samples):
-                    self.publish(i, length)
-                    time.sleep(min_uart_delay)
+                    publish(i, length)
+                    deadline += min_uart_delay
+                    remaining = deadline - clock()
+                    if remaining > 0:
+                        sleep(remaining)
                     pbar()
-                    outstanding_messages.append(
-                        len(self.latency_msg_sent) - len(self.latency_msg_received)
-                    )
+                    outstanding = len(sent) - len(received)
+                    record_outstanding(outstanding)
+                    outstanding_max = max(outstanding_max, outstanding)
 
                 burst_elapsed_time = time.perf_counter() - burst_init_time
-                logger.info("Waiting for %d seconds to collect results...", wait_time)
-                time.sleep(wait_time)
+                logger.info("Waiting up to %d seconds to collect results...", wait_time)
+                self._wait_for_echoes(wait_time)
                 status_after = self._request_status_snapshot()
                 outstanding_final = len(self.latency_msg_sent) - len(
                     self.latency_msg_received
@@ -104,22 +119,15 @@ class BaudRateTest(BaseTest):
                     bitrate=bitrate,
                 )
                 test_results["baudrate"] = rate
-                latency_results = list(self.latency_msg_received.values())
                 output_data.append(
-                    {
-                        **test_results,
-                        "results": latency_results,
-                        "outstanding_messages": outstanding_messages,
-                        "outstanding_max": max(
-                            [*outstanding_messages, outstanding_final], default=0
-                        ),
-                        "outstanding_final": outstanding_final,
-                        "status_before": status_before,
-                        "status_after": status_after,
-                        "status_delta": self._calculate_status_delta(
-                            status_before, status_after
-                        ),
-                    }
+                    self._build_iteration_output(
+                        test_results,
+                        outstanding_messages,
+                        max(outstanding_max, outstanding_final),
+                        outstanding_final,
+                        status_before,
+                        status_after,
+                    )
                 )
 
         if restore_baudrate:
@@ -1,9 +1,26 @@
 """Checksum calculation functions."""
 
+# Below this size a per-byte loop beats the wide-integer fold.
+_WORD_FOLD_MIN_BYTES = 64
 
-def calculate_checksum(data: bytes) -> bytes:
+
+def calculate_checksum(data: bytes | bytearray | memoryview) -> int:
     """Calculate checksum by XORing all bytes in the data."""
-    checksum = 0
-    for byte in data:
-        checksum ^= byte
-    return bytes([checksum])
+    if len(data) < _WORD_FOLD_MIN_BYTES:
+        checksum = 0
+        for byte in data:
+            checksum ^= byte
+        return checksum
+
+    # Fold the buffer onto itself until it fits in one 64-bit word, then
+    # collapse the word; XOR is position-independent so lanes can be mixed.
+    value = int.from_bytes(data)
+    width = len(data)
+    while width > 8:  # noqa: PLR2004  # 8 bytes = one 64-bit word
+        half = (width + 1) // 2
+        value = (value >> (8 * half)) ^ (value & ((1 << (8 * half)) - 1))
+        width = half
+    value ^= value >> 32
+    value ^= value >> 16
+    value ^= value >> 8
+    return value & 0xFF
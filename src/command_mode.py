@@ -1,11 +1,15 @@
 """Command mode module for handling command operations."""
 
 import logging
+import os
 import queue
+import select
+import struct
 import sys
 import threading
+from collections.abc import Callable
+from typing import ClassVar
 
-from cobs import cobs
 from rich.panel import Panel
 
 from checksum import calculate_checksum
@@ -17,6 +21,19 @@ setup_logging()
 
 logger = logging.getLogger(__name__)
 
+STDIN_POLL_TIMEOUT_S = 0.1
+
+# Command ids compared on every received frame.
+_KEY_COMMAND = SerialCommand.KEY_COMMAND.value
+_ANALOG_COMMAND = SerialCommand.ANALOG_COMMAND.value
+
+# Frame header: id high bits, id low bits + command, payload length.
+FRAME_HEADER = struct.Struct(">BBB")
+# Fixed layouts of the two frame types decoded here: header + key byte, and
+# header + channel + 16-bit value.
+KEY_FRAME = struct.Struct(">BBBB")
+ANALOG_FRAME = struct.Struct(">BBBBH")
+
 
 class CommandMode:
     """
@@ -37,10 +54,14 @@ class CommandMode:
 
         """
         self.serial_interface = serial_interface
-        self.message_queue = queue.Queue()
         self.running = False
-        self.input_lock = threading.Lock()
+        # All terminal output goes through one writer thread, so the input
+        # and message threads never contend for stdout.
+        self._output_queue: queue.SimpleQueue[str | None] = queue.SimpleQueue()
+        # True only while the writer thread drains _output_queue.
+        self._writer_active = False
         self.current_input = ""
+        self._pending_input = ""
         self.prompt = "\nEnter hex data (x to exit): "
 
     def execute_command_mode(self) -> None:
@@ -54,14 +75,17 @@ class CommandMode:
                 )
             )
             self.running = True
-            message_thread = threading.Thread(target=self._process_messages)
-            message_thread.start()
+            # A fresh queue drops output left over from a previous session.
+            self._output_queue = queue.SimpleQueue()
+            self._writer_active = True
+            writer_thread = threading.Thread(target=self._output_writer, daemon=True)
+            writer_thread.start()
 
             try:
                 while self.running:
                     self._print_prompt()
                     hex_data = self._get_input()
-                    if hex_data.lower() == "x":
+                    if hex_data.lower() == "x" or not self.running:
                         logger.info("Exiting send command menu...")
                         self.running = False
                         break
@@ -69,7 +93,9 @@ class CommandMode:
             except KeyboardInterrupt:
                 self.running = False
 
-            message_thread.join()
+            self._writer_active = False
+            self._output_queue.put(None)
+            writer_thread.join()
         else:
             console.print(
                 Panel(
@@ -79,41 +105,61 @@ class CommandMode:
                 )
             )
 
+    def _output_writer(self) -> None:
+        """Write queued terminal output until the ``None`` sentinel arrives."""
+        while (text := self._output_queue.get()) is not None:
+            sys.stdout.write(text)
+            sys.stdout.flush()
+
+    def _write(self, text: str) -> None:
+        """Queue text for the output writer thread."""
+        if text:
+            self._output_queue.put(text)
+
     def _print_prompt(self) -> None:
         """Print the input prompt."""
-        with self.input_lock:
-            sys.stdout.write(self.prompt)
-            sys.stdout.flush()
+        self._write(self.prompt)
+
+    def _read_stdin_chunk(self) -> str:
+        """Return the next line of input, or "" after a short poll on a tty."""
+        # select() only accepts sockets on Windows, and on pipes or files the
+        # sys.stdin buffer can hold lines select() cannot see; there, block on
+        # readline as before. A canonical-mode tty hands over one line per
+        # read, so polling it first cannot strand buffered input.
+        if os.name != "nt" and sys.stdin.isatty():
+            ready, _, _ = select.select([sys.stdin], [], [], STDIN_POLL_TIMEOUT_S)
+            if not ready:
+                return ""
+        data = sys.stdin.readline()
+        if not data:
+            # End of input: leave the command loop instead of polling forever.
+            self.running = False
+        return data
 
     def _get_input(self) -> str:
         """Get input from the user."""
         self.current_input = ""
         while self.running:
-            char = sys.stdin.read(1)
-            with self.input_lock:
+            chunk = self._pending_input or self._read_stdin_chunk()
+            self._pending_input = ""
+            echo: list[str] = []
+            for index, char in enumerate(chunk):
                 if char == "\n":
+                    # Keep pasted lines after this one for the next prompt.
+                    self._pending_input = chunk[index + 1 :]
+                    self._write("".join(echo))
                     return self.current_input
 
                 if char == "\x7f":  # Handle backspace
                     if self.current_input:
                         self.current_input = self.current_input[:-1]
-                        sys.stdout.write("\b \b")
-                        sys.stdout.flush()
+                        echo.append("\b \b")
                 else:
                     self.current_input += char
-                    sys.stdout.write(char)
-                    sys.stdout.flush()
+                    echo.append(char)
+            self._write("".join(echo))
         return ""
 
-    def _process_messages(self) -> None:
-        """Process incoming messages from the queue."""
-        while self.running:
-            try:
-                message = self.message_queue.get(timeout=0.1)
-                self._handle_message(*message)
-            except queue.Empty:
-                continue
-
     def handle_message(
         self,
         command: int,
@@ -123,6 +169,10 @@ class CommandMode:
         """
         Handle incoming messages in command mode.
 
+        Runs on the serial processing thread; output is queued to the writer
+        thread so it is serialised with the prompt being typed on the main
+        thread.
+
         Args:
         ----
         command (int): The command received.
@@ -130,42 +180,36 @@ class CommandMode:
         byte_string (bytes): The raw byte string received.
 
         """
-        # Add message to queue for processing
-        self.message_queue.put((command, decoded_data, byte_string))
-
-    def _handle_message(
-        self,
-        command: int,
-        decoded_data: bytes,
-        byte_string: bytes,
-    ) -> None:
-        """Handle messages from the queue."""
         # Filter analog command to not clutter the output
-        if command != SerialCommand.ANALOG_COMMAND.value:
-            with self.input_lock:
-                # Clear the current line
-                sys.stdout.write(
-                    "\r" + " " * (len(self.prompt) + len(self.current_input)) + "\r",
-                )
-                sys.stdout.flush()
-
-                # Print the message
-                cobs_decoded = cobs.decode(byte_string)
-                received_checksum = cobs_decoded[-1:]
-                calculated_checksum = calculate_checksum(cobs_decoded[:-1])
-                logger.info(
-                    "Received raw: %s, decoded: %s, \
-                        Received Checksum: %s, Calculated Checksum: %s",
-                    byte_string,
-                    decoded_data,
-                    received_checksum,
-                    calculated_checksum,
-                )
-                self._print_decoded_message(decoded_data)
+        if command == _ANALOG_COMMAND:
+            return
+
+        # Print the message; skip the decode work when INFO is off
+        if logger.isEnabledFor(logging.INFO):
+            # decoded_data is the COBS-decoded frame, checksum included
+            received_checksum = decoded_data[-1]
+            calculated_checksum = calculate_checksum(memoryview(decoded_data)[:-1])
+            logger.info(
+                "Received raw: %s, decoded: %s, \
+                    Received Checksum: %s, Calculated Checksum: %s",
+                byte_string,
+                decoded_data,
+                received_checksum,
+                calculated_checksum,
+            )
+            self._print_decoded_message(decoded_data)
 
-                # Reprint the prompt and current input
-                sys.stdout.write(self.prompt + self.current_input)
-                sys.stdout.flush()
+        # Outside command mode nothing drains the output queue; don't let
+        # prompt redraws pile up there.
+        if not self._writer_active:
+            return
+
+        # Clear the current line and reprint the prompt and current input in
+        # one write; log records are emitted by the logging listener thread,
+        # not through this stream.
+        current_input = self.current_input
+        width = len(self.prompt) + len(current_input)
+        self._write("\r" + " " * width + "\r" + self.prompt + current_input)
 
     def _print_decoded_message(self, message: bytes) -> None:
         """
@@ -176,24 +220,59 @@ class CommandMode:
         message (bytes): The message to decode and print.
 
         """
-        logout = " ".join(f"{i}: {msg}" for i, msg in enumerate(message))
-        logger.info("Decoded message: %s", logout)
-        rxid = (message[0] << 3) | ((message[1] & 0xE0) >> 5)
-        command = message[1] & 0x1F
-        length = message[2]
-        logger.info("Id: %s, Command: %s", rxid, command)
-        if command == SerialCommand.KEY_COMMAND.value:
-            state = message[3] & 0x01
-            col = (message[3] >> 4) & 0x0F
-            row = (message[3] >> 1) & 0x0F
-            logger.info(
-                "Column: %s, Row: %s, State: %s, Length: %s",
-                col,
-                row,
-                state,
-                length,
-            )
-        elif command == SerialCommand.ANALOG_COMMAND.value:
-            channel = message[3]
-            value = (message[4] << 8) | message[5]
-            logger.info("Channel: %s, Value: %s", channel, value)
+        if len(message) < FRAME_HEADER.size:
+            logger.info("Invalid message")
+            return
+        self._FRAME_PRINTERS.get(message[1] & 0x1F, self._print_frame)(message)
+
+    @staticmethod
+    def _print_frame(message: bytes) -> None:
+        """Log a frame of any other command with its id and command."""
+        id_high, id_low_command, _ = FRAME_HEADER.unpack_from(message)
+        logger.info(
+            "Decoded message: %s, Id: %s, Command: %s",
+            message.hex(" "),
+            (id_high << 3) | (id_low_command >> 5),
+            id_low_command & 0x1F,
+        )
+
+    @staticmethod
+    def _print_key_frame(message: bytes) -> None:
+        """Log a keypad frame with its column, row and state."""
+        if len(message) < KEY_FRAME.size:
+            logger.info("Invalid message")
+            return
+        id_high, id_low_command, length, key = KEY_FRAME.unpack_from(message)
+        logger.info(
+            "Decoded message: %s, Id: %s, Command: %s, "
+            "Column: %s, Row: %s, State: %s, Length: %s",
+            message.hex(" "),
+            (id_high << 3) | (id_low_command >> 5),
+            id_low_command & 0x1F,
+            (key >> 4) & 0x0F,
+            (key >> 1) & 0x0F,
+            key & 0x01,
+            length,
+        )
+
+    @staticmethod
+    def _print_analog_frame(message: bytes) -> None:
+        """Log an analog frame with its channel and value."""
+        if len(message) < ANALOG_FRAME.size:
+            logger.info("Invalid message")
+            return
+        id_high, id_low_command, _, channel, value = ANALOG_FRAME.unpack_from(message)
+        logger.info(
+            "Decoded message: %s, Id: %s, Command: %s, Channel: %s, Value: %s",
+            message.hex(" "),
+            (id_high << 3) | (id_low_command >> 5),
+            id_low_command & 0x1F,
+            channel,
+            value,
+        )
+
+    # Frame printers keyed by command id, looked up once per decoded frame.
+    _FRAME_PRINTERS: ClassVar[dict[int, Callable[[bytes], None]]] = {
+        _KEY_COMMAND: _print_key_frame,
+        _ANALOG_COMMAND: _print_analog_frame,
+    }
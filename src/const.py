@@ -3,4 +3,4 @@
 TEST_RESULTS_FOLDER = "test_results"
 PORT_NAME = "/dev/cu.usbmodem101"
 BAUDRATE = 921600
-TIMEOUT = 0.1
+TIMEOUT = 1.0
@@ -32,13 +32,12 @@ from __future__ import annotations
 
 import cobs.cobs as _cobs
 
+from checksum import calculate_checksum
+
 
 def _cobs_frame(body: bytes) -> bytes:
     """COBS-encode body, append XOR checksum byte, and append 0x00 delimiter."""
-    checksum = 0
-    for b in body:
-        checksum ^= b
-    return _cobs.encode(body + bytes([checksum])) + b"\x00"
+    return _cobs.encode(body + bytes([calculate_checksum(body)])) + b"\x00"
 
 
 # ---------------------------------------------------------------------------
@@ -101,10 +100,7 @@ def bad_checksum() -> bytes:
     # payload: two arbitrary bytes
     body = bytes([0x00, 0x34, 0x02, 0x11, 0x22])
     # Compute the correct checksum, then corrupt it
-    correct_checksum = 0
-    for b in body:
-        correct_checksum ^= b
-    bad_cs = correct_checksum ^ 0xFF  # flip all bits so XOR verify fails
+    bad_cs = calculate_checksum(body) ^ 0xFF  # flip all bits so XOR verify fails
     return _cobs.encode(body + bytes([bad_cs])) + b"\x00"
 
 
@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
-import datetime
+import functools
 import logging
+import struct
 import threading
 import time
 from collections import deque
@@ -26,9 +27,30 @@ LIVE_REFRESH_PER_SEC: float = 2.0
 _ADC_COLOUR_LOW_THRESHOLD: float = 0.25
 _ADC_COLOUR_HIGH_THRESHOLD: float = 0.75
 
+_KEY_COMMAND: int = SerialCommand.KEY_COMMAND.value
+_ANALOG_COMMAND: int = SerialCommand.ANALOG_COMMAND.value
+
 _SPARK_CHARS = "▁▂▃▄▅▆▇█"
 _ADC_MAX: int = 4095
 
+# (col, row, state) for every possible key byte, so each keypad frame is
+# decoded with one lookup instead of three shift/mask expressions.
+_KEY_DECODE: tuple[tuple[int, int, int], ...] = tuple(
+    ((key >> 4) & 0x0F, (key >> 1) & 0x07, key & 0x01) for key in range(256)
+)
+# Analog payload after the 3-byte header: channel, 16-bit big-endian value.
+_ANALOG_PAYLOAD = struct.Struct(">BH")
+# Distinct seconds kept formatted. New events only add the current second,
+# but each redraw formats every timestamp still on screen, so the cache
+# must hold the few dozen seconds one table spans or rows miss in a cycle.
+_UTC_SECOND_CACHE_SIZE: int = 32
+
+
+@functools.lru_cache(maxsize=_UTC_SECOND_CACHE_SIZE)
+def _fmt_utc_second(second: int) -> str:
+    """Format a whole Unix second as ``HH:MM:SS.`` (UTC), once per second."""
+    return time.strftime("%H:%M:%S.", time.gmtime(second))
+
 
 class KeypadAdcMonitor:
     """Monitor for keypad press/release events and ADC channel readings."""
@@ -52,18 +74,15 @@ class KeypadAdcMonitor:
     def handle_message(self, command: int, decoded_data: bytes) -> None:
         """Dispatch incoming frames to the appropriate handler."""
         try:
-            if command == SerialCommand.KEY_COMMAND.value:
-                col = (decoded_data[3] >> 4) & 0x0F
-                row = (decoded_data[3] >> 1) & 0x07
-                state = decoded_data[3] & 0x01
+            if command == _KEY_COMMAND:
+                col, row, state = _KEY_DECODE[decoded_data[3]]
                 ts = time.time()
                 with self._lock:
                     self._keypad_events.append((col, row, state, ts))
                 logger.debug("Keypad: col=%d row=%d state=%d", col, row, state)
 
-            elif command == SerialCommand.ANALOG_COMMAND.value:
-                channel = decoded_data[3]
-                value = (decoded_data[4] << 8) | decoded_data[5]
+            elif command == _ANALOG_COMMAND:
+                channel, value = _ANALOG_PAYLOAD.unpack_from(decoded_data, 3)
                 ts = time.time()
                 with self._lock:
                     if channel not in self._adc_history:
@@ -71,7 +90,7 @@ class KeypadAdcMonitor:
                     self._adc_history[channel].append((value, ts))
                 logger.debug("ADC ch=%d value=%d", channel, value)
 
-        except IndexError:
+        except (IndexError, struct.error):
             logger.exception("Malformed message (command=%d)", command)
 
     # ------------------------------------------------------------------
@@ -93,8 +112,8 @@ class KeypadAdcMonitor:
     @staticmethod
     def _fmt_ts(ts: float) -> str:
         """Format a Unix timestamp as HH:MM:SS.mmm (UTC)."""
-        dt = datetime.datetime.fromtimestamp(ts, tz=datetime.UTC)
-        return dt.strftime("%H:%M:%S.") + f"{dt.microsecond // 1000:03d}"
+        second, millis = divmod(int(ts * 1000), 1000)
+        return _fmt_utc_second(second) + f"{millis:03d}"
 
     def _build_adc_table(self) -> Table:
         """Build a Rich table showing per-channel ADC history."""
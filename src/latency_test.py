@@ -3,19 +3,22 @@
 from __future__ import annotations
 
 import logging
-import random
 import time
 from pathlib import Path
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING
 
+import numpy as np
 from alive_progress import alive_bar
 
 from base_test import (
     DEFAULT_MESSAGE_LENGTH,
     DEFAULT_SAMPLES,
     DEFAULT_WAIT_TIME,
+    FRAME_OVERHEAD_BYTES,
     MAX_SAMPLE_SIZE,
     BaseTest,
+    ResultStream,
+    uart_drain_time_s,
 )
 from const import TEST_RESULTS_FOLDER
 from logger_config import setup_logging
@@ -27,6 +30,9 @@ if TYPE_CHECKING:
 DEFAULT_NUM_TIMES = 5
 DEFAULT_MAX_WAIT = 0.1
 DEFAULT_MIN_WAIT = 0
+# Wake this long before a send deadline and spin the rest; OS sleep
+# granularity would otherwise make every interval overshoot.
+SLEEP_SPIN_MARGIN_S = 0.0005
 
 setup_logging()
 
@@ -50,54 +56,84 @@ class LatencyTest(BaseTest):
         length: int = DEFAULT_MESSAGE_LENGTH,
         *,
         jitter: bool = False,
+        pipeline_depth: int = 1,
     ) -> None:
-        """Execute the main test given the desired parameters."""
+        """
+        Execute the main test given the desired parameters.
+
+        ``pipeline_depth`` messages are sent back-to-back at the start of each
+        burst before pacing begins, so that many echoes can be in flight.
+        """
         output_filename = make_result_filename("latency", self._run_id)
         file_path = Path(__file__).parent.parent / TEST_RESULTS_FOLDER / output_filename
 
-        output_data: list[dict[str, Any]] = []
-        latency_results_copy: list[list[float]] = [[] for _ in range(num_times)]
         bar_title = f"Test / Jitter: {jitter}"
 
-        # Minimum delay for UART TX buffer to drain: COBS adds ~2 bytes overhead,
-        # and 8N1 encoding means 10 bits per byte on the wire.
-        wire_bytes = length + 4  # payload + COBS overhead + delimiter
-        min_uart_delay = (wire_bytes * 10) / self.ser.baudrate
+        # Minimum delay for UART TX buffer to drain.
+        min_uart_delay = uart_drain_time_s(length, self.ser.baudrate)
         logger.info(
             "Minimum UART drain time: %.3f ms (baud=%d, wire_bytes=%d)",
             min_uart_delay * 1e3,
             self.ser.baudrate,
-            wire_bytes,
+            length + FRAME_OVERHEAD_BYTES,
         )
 
-        with alive_bar(samples * num_times, title=bar_title) as pbar:
+        # Per-burst wait schedule, ramping from min_wait to max_wait, and all
+        # jitter draws for the run, computed once up front.
+        waits = np.maximum(np.linspace(min_wait, max_wait, num_times), min_uart_delay)
+        random_max = (max_wait - min_wait) * 0.2
+        jitter_draws = (
+            np.random.default_rng().uniform(0, random_max, (num_times, samples))
+            if jitter
+            else None
+        )
+        # Each burst's record is written out as soon as the burst completes.
+        with (
+            ResultStream(file_path) as results,
+            alive_bar(samples * num_times, title=bar_title) as pbar,
+        ):
             for j in range(num_times):
                 self.latency_msg_sent.clear()
                 self.latency_msg_received.clear()
                 outstanding_messages: list[int] = []
+                outstanding_max = 0
                 status_before = self._request_status_snapshot()
-                raw_wait = min_wait + (max_wait - min_wait) * (j / (num_times - 1))
-                waiting_time = max(raw_wait, min_uart_delay)
+                waiting_time = float(waits[j])
                 logger.info("Test %s, waiting time: %d s", j, waiting_time)
-                random_max = (max_wait - min_wait) * 0.2
-
-                burst_init_time = time.perf_counter()
-                for i in range(samples):
-                    self.publish(i, length)
-                    if jitter:
-                        time.sleep(
-                            waiting_time + random.uniform(0, random_max),  # noqa: S311  # Jitter is not for cryptographic security
-                        )
-                    else:
-                        time.sleep(waiting_time)
+                intervals = np.full(samples, waiting_time)
+                if jitter_draws is not None:
+                    intervals += jitter_draws[j]
+                # The first pipeline_depth sends go out without pacing.
+                intervals[: max(pipeline_depth, 1) - 1] = 0.0
+
+                # Bind per-sample callables and dicts to locals; the loop runs
+                # at the send rate, so attribute lookups show up as jitter.
+                publish = self.publish
+                sleep = time.sleep
+                clock = time.perf_counter
+                record_outstanding = outstanding_messages.append
+                sent = self.latency_msg_sent
+                received = self.latency_msg_received
+
+                # Sleep towards absolute send deadlines so publish/logging time
+                # does not stretch the spacing between samples.
+                burst_init_time = deadline = clock()
+                for i, interval in enumerate(intervals.tolist()):
+                    publish(i, length)
+                    deadline += interval
+                    remaining = deadline - clock()
+                    if remaining > SLEEP_SPIN_MARGIN_S:
+                        sleep(remaining - SLEEP_SPIN_MARGIN_S)
+                    while clock() < deadline:
+                        pass
                     pbar()
-                    outstanding_messages.append(
-                        len(self.latency_msg_sent) - len(self.latency_msg_received)
-                    )
+                    outstanding = len(sent) - len(received)
+                    record_outstanding(outstanding)
+                    outstanding_max = max(outstanding_max, outstanding)
 
                 burst_elapsed_time = time.perf_counter() - burst_init_time
-                logger.info("Waiting for %d seconds to collect results...", wait_time)
-                time.sleep(wait_time)
+                logger.info("Waiting up to %d seconds to collect results...", wait_time)
+                self._wait_for_echoes(wait_time)
                 status_after = self._request_status_snapshot()
                 outstanding_final = len(self.latency_msg_sent) - len(
                     self.latency_msg_received
@@ -112,26 +148,17 @@ class LatencyTest(BaseTest):
                     bitrate=bitrate,
                     jitter=jitter,
                 )
-                latency_results_copy[j] = list(self.latency_msg_received.values())
-                output_data.append(
-                    {
-                        **test_results,
-                        "results": latency_results_copy[j],
-                        "outstanding_messages": outstanding_messages,
-                        "outstanding_max": max(
-                            [*outstanding_messages, outstanding_final], default=0
-                        ),
-                        "outstanding_final": outstanding_final,
-                        "status_before": status_before,
-                        "status_after": status_after,
-                        "status_delta": self._calculate_status_delta(
-                            status_before, status_after
-                        ),
-                    }
+                results.append(
+                    self._build_iteration_output(
+                        test_results,
+                        outstanding_messages,
+                        max(outstanding_max, outstanding_final),
+                        outstanding_final,
+                        status_before,
+                        status_after,
+                    )
                 )
 
-        self._write_output_to_file(file_path, output_data)
-
     def _default_min_wait_ms(
         self, message_length: int = DEFAULT_MESSAGE_LENGTH
     ) -> float:
@@ -143,8 +170,7 @@ class LatencyTest(BaseTest):
         if not isinstance(baudrate, int | float) or baudrate <= 0:
             return DEFAULT_MIN_WAIT * 1000
 
-        wire_bytes = message_length + 4  # payload + COBS overhead + delimiter
-        return (wire_bytes * 10 / baudrate) * 1000
+        return uart_drain_time_s(message_length, baudrate) * 1000
 
     def _show_options(self) -> tuple[int, float, float, int, int, bool, int]:
         """Show options to user and get input."""
@@ -256,6 +282,7 @@ class LatencyTest(BaseTest):
         samples: int = DEFAULT_SAMPLES,
         length: int = DEFAULT_MESSAGE_LENGTH,
         jitter: bool = False,
+        pipeline_depth: int = 1,
     ) -> None:
         """Run the latency test non-interactively using explicit arguments."""
         if self.ser is None:
@@ -270,4 +297,5 @@ class LatencyTest(BaseTest):
             samples=samples,
             length=length,
             jitter=jitter,
+            pipeline_depth=pipeline_depth,
         )
@@ -11,6 +11,33 @@ import queue
 import sys
 from pathlib import Path
 
+# Argument types that cannot change between the logging call and the
+# listener thread formatting the record.
+_IMMUTABLE_ARG_TYPES = frozenset({str, bytes, int, float, bool, type(None)})
+
+
+class _DeferredFormatQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves message formatting to the listener thread.
+
+    The stock ``prepare`` formats every record on the logging thread; when
+    all arguments are immutable the record is queued as is instead, so the
+    ``%`` formatting (e.g. the repr of a frame) happens off the caller.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Queue the record unformatted when its arguments cannot change."""
+        args = record.args
+        if record.exc_info is None and (
+            not args
+            or (
+                isinstance(args, tuple)
+                and all(type(arg) in _IMMUTABLE_ARG_TYPES for arg in args)
+            )
+        ):
+            return record
+        return super().prepare(record)
+
 
 class _Dispatch:
     """Module-local state for the async logging dispatcher."""
@@ -121,7 +148,7 @@ def _install_queue_dispatch() -> None:
         return
 
     log_queue: queue.Queue[logging.LogRecord] = queue.Queue(-1)
-    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler = _DeferredFormatQueueHandler(log_queue)
 
     for logger in loggers:
         if logger.handlers:
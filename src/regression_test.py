@@ -9,6 +9,10 @@ setup_logging()
 
 logger = logging.getLogger(__name__)
 
+_ECHO_COMMAND = SerialCommand.ECHO_COMMAND.value
+# Echo frame sent by the regression test and expected back unchanged.
+_ECHO_PAYLOAD = bytes([0x00, 0x34, 0x02, 0x01, 0x02])
+
 
 class RegressionTest:
     """Regression test class."""
@@ -25,32 +29,21 @@ class RegressionTest:
         byte_string: bytes,
     ) -> None:
         """Handle message for regression test."""
-        if command == SerialCommand.ECHO_COMMAND.value:
-            try:
-                if decoded_data == bytes([0x00, 0x34, 0x02, 0x01, 0x02]):
-                    logger.info("[OK] Echo command")
-                else:
-                    logger.info("[FAIL] Echo command")
-
-                logger.info(
-                    "Expected: %s",
-                    bytes([0x00, 0x34, 0x02, 0x01, 0x02]),
-                )
-                logger.info(
-                    "Received: %s, command: %s, decoded: %s",
-                    byte_string,
-                    command,
-                    decoded_data,
-                )
-                logger.info("Test ended")
-            except IndexError:
-                logger.exception("Invalid message (Index Error)")
-                return
+        if command == _ECHO_COMMAND:
+            # One record per echo: a single trip through the log queue.
+            logger.info(
+                "[%s] Echo command\nExpected: %s\n"
+                "Received: %s, command: %s, decoded: %s\nTest ended",
+                "OK" if decoded_data == _ECHO_PAYLOAD else "FAIL",
+                _ECHO_PAYLOAD,
+                byte_string,
+                command,
+                decoded_data,
+            )
 
     def test_echo_command(self) -> None:
         """Test echo command."""
-        payload = bytes([0x00, 0x34, 0x02, 0x01, 0x02])
-        self.ser.write(payload)
+        self.ser.write(_ECHO_PAYLOAD)
 
     def execute_test(self) -> None:
         """Execute regression test."""
@@ -2,8 +2,12 @@
 
 from __future__ import annotations
 
-import datetime
-from typing import Any
+import os
+import time
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from pathlib import Path
 
 RESULT_FORMAT_VERSION = 1
 FORMAT_STRESS_RUN = "stress_run"
@@ -26,7 +30,8 @@ def make_result_envelope(
 
 def make_result_filename(test_type: str, run_id: str) -> str:
     """Return ``YYYYMMDD-HHMMSS-<run_id>-<type>.json``."""
-    timestamp = datetime.datetime.now(tz=datetime.UTC).strftime("%Y%m%d-%H%M%S")
+    # time.gmtime() gives the UTC fields without building a datetime object.
+    timestamp = time.strftime("%Y%m%d-%H%M%S", time.gmtime())
     return f"{timestamp}-{run_id}-{test_type}.json"
 
 
@@ -41,3 +46,22 @@ def parse_result_envelope(data: Any) -> tuple[str, Any] | None:
         return None
 
     return format_type, payload
+
+
+def write_text_atomic(file_path: Path, content: str) -> None:
+    """
+    Write ``content`` to ``file_path`` in one write, replacing it atomically.
+
+    The text goes to a sibling ``.tmp`` file that is fsynced and renamed over
+    the target, so an interrupted write never leaves a truncated result file.
+    """
+    tmp_path = file_path.with_name(file_path.name + ".tmp")
+    try:
+        with tmp_path.open("w", encoding="utf-8") as output_file:
+            output_file.write(content)
+            output_file.flush()
+            os.fsync(output_file.fileno())
+        tmp_path.replace(file_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
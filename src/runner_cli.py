@@ -239,6 +239,12 @@ def _make_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Enable random delay jitter inside latency mode.",
     )
+    latency_group.add_argument(
+        "--pipeline-depth",
+        default=1,
+        type=int,
+        help="Echo messages sent back-to-back before pacing starts (default: 1).",
+    )
 
     # Baud sweep mode options
     baud_group = parser.add_argument_group("Baud sweep mode options")
@@ -345,6 +351,7 @@ def _run_latency_mode(
         samples=args.samples,
         length=args.message_length,
         jitter=bool(args.jitter),
+        pipeline_depth=args.pipeline_depth,
     )
     sink.emit("mode_finished", mode=args.mode)
     return tester
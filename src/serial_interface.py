@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import contextlib
+import functools
 import logging
 import queue
 import threading
@@ -22,6 +24,22 @@ setup_logging()
 
 logger = logging.getLogger(__name__)
 
+# Sent frames repeat: a run sends the same echo payloads (counter 0..samples-1
+# at one length) every burst, and status requests are fixed. Bursts cycle
+# through the counters, which an LRU smaller than the burst evicts before
+# reuse, so the cache holds every 16-bit counter plus room for status and
+# command frames (about 15 MB for a full 65536-sample run).
+ENCODED_FRAME_CACHE_SIZE = (1 << 16) + 1024
+
+
+@functools.lru_cache(maxsize=ENCODED_FRAME_CACHE_SIZE)
+def encode_frame(data: bytes) -> bytes:
+    """Append the checksum to ``data``, COBS-encode it and add the delimiter."""
+    # Append the checksum in place rather than concatenating a one-byte copy.
+    frame = bytearray(data)
+    frame.append(calculate_checksum(data))
+    return cobs.encode(frame) + b"\x00"
+
 
 class SerialCommand(Enum):
     """Command enum."""
@@ -59,13 +77,18 @@ class SerialInterface:
         self.ser = None
         self.stop_event = threading.Event()
         self.message_handler: Callable[[int, bytes, bytes], None] | None = None
-        self.message_queue = queue.Queue()
+        # One producer (read thread) and one consumer (processing thread);
+        # SimpleQueue skips Queue's Condition and task accounting.
+        self.message_queue: queue.SimpleQueue[bytes] = queue.SimpleQueue()
         self.read_thread = threading.Thread(target=self._read_data)
         self.processing_thread = threading.Thread(target=self._process_messages)
         self.read_thread.daemon = True
         self.processing_thread.daemon = True
         self.buffer = bytearray()
         self.statistics: SerialStatistics = SerialStatistics()
+        # Serialises frame writes from different threads; reads are not
+        # locked, the read thread is the only reader.
+        self._write_lock = threading.Lock()
 
     def open(self) -> bool:
         """Open serial port."""
@@ -98,6 +121,7 @@ class SerialInterface:
         # Only attempt to join if we're not in the read thread
         current_thread = threading.current_thread()
         if self.read_thread and current_thread != self.read_thread:
+            self._cancel_pending_read()
             self.read_thread.join()
         if self.processing_thread and current_thread != self.processing_thread:
             self.processing_thread.join()
@@ -106,6 +130,14 @@ class SerialInterface:
             self.ser.close()
             logger.info("Serial port closed")
 
+    def _cancel_pending_read(self) -> None:
+        """Wake a read blocked in the port timeout so the read thread can exit."""
+        cancel_read = getattr(self.ser, "cancel_read", None)
+        if cancel_read is not None:
+            # The read thread may be closing the port at the same moment.
+            with contextlib.suppress(OSError, serial.SerialException):
+                cancel_read()
+
     def set_baudrate(self, baudrate: int) -> bool:
         """Close, change baud rate, reopen the port, and restart read threads."""
         self.close()
@@ -131,14 +163,15 @@ class SerialInterface:
         try:
             if self.ser:
                 if not self.stop_event.is_set():
-                    checksum = calculate_checksum(data)
-                    payload_with_checksum = data + checksum
-                    message = cobs.encode(payload_with_checksum) + b"\x00"
-                    bytes_writen = self.ser.write(message) or 0
-                    self.statistics.bytes_sent += bytes_writen
+                    message = encode_frame(bytes(data))
                     command: int = data[1] & 0x1F
-                    self.statistics.commands_sent[command] += 1
-                    logger.info("Published (encoded) `%s`", message)
+                    with self._write_lock:
+                        bytes_writen = self.ser.write(message) or 0
+                        self.statistics.bytes_sent += bytes_writen
+                        self.statistics.commands_sent[command] += 1
+                    # Runs once per sample during measurements; stay off INFO.
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("Published (encoded) `%s`", message)
             else:
                 logger.info("Serial port not open")
         except IndexError:
@@ -201,21 +234,41 @@ class SerialInterface:
             elif len(self.buffer) < self.BUFFER_LOW_WATER:
                 self.ser.rts = True  # Allow sender to send
 
-        for byte in data:
-            if byte == 0:  # COBS packet delimiter
-                if self.buffer:  # Only process if we have a complete packet
-                    self.message_queue.put(bytes(self.buffer))
-                    self.buffer.clear()  # Clear buffer only after processing
+        # Split on the COBS delimiter in C rather than walking bytes in
+        # Python; every part except the last completes a frame.
+        *complete, partial = data.split(b"\x00")
+        for part in complete:
+            if self.buffer:
+                # Extend the reused buffer in place; one bytes copy per frame.
+                self.buffer += part
+                frame = bytes(self.buffer)
+                self.buffer.clear()
             else:
-                self.buffer.append(byte)
+                frame = part
+            if len(frame) > max_message_size:
+                frame = self._drop_oversized(frame, max_message_size)
+            if frame:  # Only process if we have a complete packet
+                self.message_queue.put(frame)
+
+        if partial:
+            self.buffer += partial
+            if len(self.buffer) > max_message_size:
+                self.buffer[:] = self._drop_oversized(self.buffer, max_message_size)
+
+    @staticmethod
+    def _drop_oversized(frame: bytes | bytearray, max_message_size: int) -> bytes:
+        """
+        Discard bytes of a malformed packet that exceeded the maximum size.
 
-                # Protection against malformed packets
-                if len(self.buffer) > max_message_size:
-                    logger.warning(
-                        "Message exceeded maximum size (%d bytes), discarding",
-                        max_message_size,
-                    )
-                    self.buffer.clear()  # Clear buffer if it exceeds max size
+        Keeps what a byte-by-byte reader clearing its buffer on every
+        overflow would be left with.
+        """
+        logger.warning(
+            "Message exceeded maximum size (%d bytes), discarding",
+            max_message_size,
+        )
+        keep = len(frame) % (max_message_size + 1)
+        return bytes(frame[len(frame) - keep :])
 
     def _read_data(self) -> None:
         """
@@ -224,7 +277,7 @@ class SerialInterface:
         Reads data from the serial port and processes COBS-encoded messages.
         A zero byte (0x00) is used as a packet delimiter in COBS encoding.
         """
-        max_message_size = 1024  # Maximum allowed message size
+        max_message_size = self.MAX_BUFFER_SIZE  # Maximum allowed message size
         logger.info("Starting read thread...")
 
         try:
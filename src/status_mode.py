@@ -1,7 +1,9 @@
 """Status mode module."""
 
 import datetime
+import functools
 import logging
+import struct
 import time
 from dataclasses import dataclass
 
@@ -14,11 +16,15 @@ from base_test import (
     STATISTICS_DISPLAY_NAMES,
     STATISTICS_HEADER_BYTES,
     STATISTICS_ITEMS,
+    STATISTICS_RESPONSE,
+    STATUS_PAYLOAD_OFFSET,
     TASK_CORE_AFFINITY,
     TASK_DISPLAY_NAMES,
     TASK_HEADER_BYTES,
     TASK_ITEMS,
+    TASK_RESPONSE,
     TASK_STACK_BYTES,
+    status_request_payload,
 )
 from serial_interface import SerialCommand, SerialInterface
 from ui_console import console
@@ -37,6 +43,10 @@ _ERROR_STAT_NAMES = frozenset(STATISTICS_DISPLAY_NAMES) - {
     "bytes_received",
 }
 
+# Compared on every received frame; resolve the enum values once.
+_STATISTICS_STATUS_COMMAND = SerialCommand.STATISTICS_STATUS_COMMAND.value
+_TASK_STATUS_COMMAND = SerialCommand.TASK_STATUS_COMMAND.value
+
 
 @dataclass
 class StatisticsItem:
@@ -78,15 +88,10 @@ class StatusMode:
     def handle_message(self, command: int, decoded_data: bytes) -> None:
         """Handle incoming messages."""
         try:
-            if command == SerialCommand.STATISTICS_STATUS_COMMAND.value:
-                status_index = decoded_data[3]
-                status_value_bytes = [
-                    decoded_data[4],
-                    decoded_data[5],
-                    decoded_data[6],
-                    decoded_data[7],
-                ]
-                status_value = int.from_bytes(status_value_bytes, byteorder="big")
+            if command == _STATISTICS_STATUS_COMMAND:
+                status_index, status_value = STATISTICS_RESPONSE.unpack_from(
+                    decoded_data, STATUS_PAYLOAD_OFFSET
+                )
 
                 # Update the corresponding error item
                 if status_index in self.error_items:
@@ -96,31 +101,10 @@ class StatusMode:
                     self.logger.info(
                         "%s value updated to %d", error_item.message, error_item.value
                     )
-            elif command == SerialCommand.TASK_STATUS_COMMAND.value:
-                status_index = decoded_data[3]
-                abs_time_bytes = [
-                    decoded_data[4],
-                    decoded_data[5],
-                    decoded_data[6],
-                    decoded_data[7],
-                ]
-                abs_time = int.from_bytes(abs_time_bytes, byteorder="big")
-
-                perc_time_bytes = [
-                    decoded_data[8],
-                    decoded_data[9],
-                    decoded_data[10],
-                    decoded_data[11],
-                ]
-                perc_time = int.from_bytes(perc_time_bytes, byteorder="big")
-
-                hwatermark_bytes = [
-                    decoded_data[12],
-                    decoded_data[13],
-                    decoded_data[14],
-                    decoded_data[15],
-                ]
-                h_watermark = int.from_bytes(hwatermark_bytes, byteorder="big")
+            elif command == _TASK_STATUS_COMMAND:
+                status_index, abs_time, perc_time, h_watermark = (
+                    TASK_RESPONSE.unpack_from(decoded_data, STATUS_PAYLOAD_OFFSET)
+                )
 
                 if status_index in self.task_items:
                     task_item = self.task_items[status_index]
@@ -130,14 +114,13 @@ class StatusMode:
                     task_item.last_updated = time.time()
                     self.logger.info("[%s] updated", task_item.name)
 
-        except IndexError:
+        except struct.error:
             self.logger.exception("Error parsing status command")
 
     def _status_update(self, header: bytes, index: int) -> None:
         """Send status update command."""
-        payload = header + bytes([0x01]) + index.to_bytes(1, byteorder="big")
         self.logger.info("Sending status update command for [%s])", index)
-        self.ser.write(payload)
+        self.ser.write(status_request_payload(header, index))
 
     def _update_statistics_status(self) -> None:
         """Send update status request for statistics items."""
@@ -163,6 +146,7 @@ class StatusMode:
         self.logger.info("Status request complete")
 
     @staticmethod
+    @functools.lru_cache(maxsize=64)
     def _fmt_timestamp(ts: float) -> str:
         """Format a Unix timestamp as a UTC datetime string, or 'N/A' if zero."""
         if ts == 0:
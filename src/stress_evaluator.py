@@ -92,11 +92,8 @@ class StressRunResult:
 # ---------------------------------------------------------------------------
 
 
-def _percentile(values: list[float], pct: float) -> float:
-    """Return the pct-th percentile of values (0-100). Returns 0.0 if empty."""
-    if not values:
-        return 0.0
-    sorted_v = sorted(values)
+def _sorted_percentile(sorted_v: list[float], pct: float) -> float:
+    """Return the pct-th percentile (0-100) of already sorted, non-empty values."""
     k = (len(sorted_v) - 1) * pct / 100.0
     lo, hi = math.floor(k), math.ceil(k)
     if lo == hi:
@@ -104,12 +101,23 @@ def _percentile(values: list[float], pct: float) -> float:
     return sorted_v[lo] * (hi - k) + sorted_v[hi] * (k - lo)
 
 
+def _percentile(values: list[float], pct: float) -> float:
+    """Return the pct-th percentile of values (0-100). Returns 0.0 if empty."""
+    if not values:
+        return 0.0
+    return _sorted_percentile(sorted(values), pct)
+
+
 def compute_latency_stats(latencies_ms: list[float]) -> tuple[float, float, float]:
     """Return (p50, p95, p99) from a list of latencies in milliseconds."""
+    if not latencies_ms:
+        return (0.0, 0.0, 0.0)
+    # Sort once and read all three ranks from the same ordering.
+    sorted_v = sorted(latencies_ms)
     return (
-        _percentile(latencies_ms, 50),
-        _percentile(latencies_ms, 95),
-        _percentile(latencies_ms, 99),
+        _sorted_percentile(sorted_v, 50),
+        _sorted_percentile(sorted_v, 95),
+        _sorted_percentile(sorted_v, 99),
     )
 
 
@@ -12,7 +12,12 @@ from rich.panel import Panel
 from rich.table import Table
 
 from const import TEST_RESULTS_FOLDER
-from result_format import FORMAT_STRESS_RUN, make_result_envelope, make_result_filename
+from result_format import (
+    FORMAT_STRESS_RUN,
+    make_result_envelope,
+    make_result_filename,
+    write_text_atomic,
+)
 from ui_console import console
 
 if TYPE_CHECKING:
@@ -39,13 +44,12 @@ def write_json_report(
     out_dir = Path(output_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
     out_path = out_dir / make_result_filename("stress", result.run_id)
+    # Serialise the whole run first so the file gets a single write.
+    content = json.dumps(
+        make_result_envelope(FORMAT_STRESS_RUN, result.to_dict()), indent=4
+    )
     try:
-        with out_path.open("w", encoding="utf-8") as f:
-            json.dump(
-                make_result_envelope(FORMAT_STRESS_RUN, result.to_dict()),
-                f,
-                indent=4,
-            )
+        write_text_atomic(out_path, content)
         logger.info("Stress report written to %s", out_path)
     except OSError:
         logger.exception("Failed to write stress report to %s", out_path)
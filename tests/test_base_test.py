@@ -19,9 +19,12 @@ from base_test import (
     TASK_HEADER_BYTES,
     TASK_ITEMS,
     BaseTest,
+    ResultStream,
+    status_request_payload,
+    uart_drain_time_s,
 )
 from result_format import FORMAT_LATENCY_SERIES
-from serial_interface import SerialCommand, SerialInterface
+from serial_interface import SerialCommand, SerialInterface, encode_frame
 
 
 @pytest.fixture
@@ -122,9 +125,9 @@ class TestPublish:
 
     def test_publish_records_send_time(self, base_test: BaseTest) -> None:
         """publish() should record the send timestamp in latency_msg_sent."""
-        before = time.perf_counter()
+        before = time.perf_counter_ns()
         base_test.publish(42, DEFAULT_MESSAGE_LENGTH)
-        after = time.perf_counter()
+        after = time.perf_counter_ns()
         assert 42 in base_test.latency_msg_sent
         assert before <= base_test.latency_msg_sent[42] <= after
 
@@ -138,6 +141,55 @@ class TestPublish:
         assert 2 in base_test.latency_msg_sent
         assert len(base_test.latency_msg_sent) == 2
 
+    def test_publish_reuses_payload_buffer(
+        self, base_test: BaseTest, mock_serial: Mock
+    ) -> None:
+        """Consecutive sends of the same length reuse one buffer."""
+        base_test.publish(1, DEFAULT_MESSAGE_LENGTH)
+        first = mock_serial.write.call_args[0][0]
+        base_test.publish(258, DEFAULT_MESSAGE_LENGTH)
+        second = mock_serial.write.call_args[0][0]
+        assert first is second
+        assert second[3:5] == (258).to_bytes(2, byteorder="big")
+
+    def test_publish_does_not_log_at_info(self) -> None:
+        """The per-send logs stay out of INFO output during measurements."""
+        ser = SerialInterface("COM1", 115200, 1)
+        ser.ser = Mock()
+        ser.ser.write.side_effect = len
+        test = BaseTest(ser)
+        with (
+            patch("base_test.logger") as mock_log,
+            patch("serial_interface.logger") as mock_serial_log,
+        ):
+            mock_serial_log.isEnabledFor.return_value = True
+            test.publish(1, DEFAULT_MESSAGE_LENGTH)
+        mock_log.info.assert_not_called()
+        mock_log.debug.assert_called_once()
+        mock_serial_log.info.assert_not_called()
+        mock_serial_log.debug.assert_called_once()
+
+    def test_second_burst_reuses_encoded_frames(self) -> None:
+        """Every send of a later burst is served from the encoded-frame cache."""
+        ser = SerialInterface("COM1", 115200, 1)
+        ser.ser = Mock()
+        ser.ser.write.side_effect = len
+        test = BaseTest(ser)
+        samples = 2000  # Larger than a burst-sized LRU could keep
+        encode_frame.cache_clear()
+
+        for i in range(samples):
+            test.publish(i, DEFAULT_MESSAGE_LENGTH)
+        for index in range(8):
+            test._status_update(STATISTICS_HEADER_BYTES, index)
+        before = encode_frame.cache_info()
+        for i in range(samples):
+            test.publish(i, DEFAULT_MESSAGE_LENGTH)
+        after = encode_frame.cache_info()
+
+        assert after.hits - before.hits == samples
+        assert after.misses == before.misses
+
     def test_publish_payload_length_matches_message_length(
         self, base_test: BaseTest, mock_serial: Mock
     ) -> None:
@@ -164,22 +216,39 @@ class TestHandleMessageEcho:
     def test_echo_command_stores_latency(self, base_test: BaseTest) -> None:
         """ECHO_COMMAND stores received latency for the correct counter."""
         counter = 5
-        base_test.latency_msg_sent[counter] = time.perf_counter() - 0.01
+        base_test.latency_msg_sent[counter] = time.perf_counter_ns() - 10_000_000
         data = self._make_echo_data(counter)
         base_test.handle_message(SerialCommand.ECHO_COMMAND.value, data)
         assert counter in base_test.latency_msg_received
         assert base_test.latency_msg_received[counter] > 0
 
-    def test_echo_command_index_error_does_not_raise(self, base_test: BaseTest) -> None:
-        """IndexError should be caught silently."""
-        # Too-short data triggers IndexError
-        base_test.handle_message(SerialCommand.ECHO_COMMAND.value, bytes([0x00]))
+    def test_echo_latency_not_logged_at_info(self, base_test: BaseTest) -> None:
+        """Per-echo latency logging should stay below INFO."""
+        counter = 6
+        base_test.latency_msg_sent[counter] = time.perf_counter_ns()
+        with patch("base_test.logger") as mock_log:
+            mock_log.isEnabledFor.return_value = False
+            base_test.handle_message(
+                SerialCommand.ECHO_COMMAND.value, self._make_echo_data(counter)
+            )
+        mock_log.info.assert_not_called()
+        mock_log.debug.assert_not_called()
+        assert counter in base_test.latency_msg_received
+
+    @pytest.mark.parametrize("length", [0, 1, 4])
+    def test_echo_command_short_frame_is_rejected(
+        self, base_test: BaseTest, length: int
+    ) -> None:
+        """A frame too short for the counter is logged and ignored."""
+        with patch("base_test.logger") as mock_log:
+            base_test.handle_message(SerialCommand.ECHO_COMMAND.value, bytes(length))
+        mock_log.info.assert_called_once_with("Invalid echo message")
+        assert base_test.latency_msg_received == {}
 
-    def test_echo_command_key_error_does_not_raise(self, base_test: BaseTest) -> None:
-        """KeyError (counter not in sent dict) should be caught silently."""
+    def test_echo_command_unknown_counter_is_ignored(self, base_test: BaseTest) -> None:
+        """An echo for a counter not in the sent dict is skipped."""
         data = self._make_echo_data(999)  # counter not in sent dict
         base_test.handle_message(SerialCommand.ECHO_COMMAND.value, data)
-        # Should not raise; counter not stored
         assert 999 not in base_test.latency_msg_received
 
 
@@ -206,7 +275,7 @@ class TestHandleMessageStatistics:
         """Valid statistics status updates _statistics_updated_at."""
         idx = 2
         data = self._make_stats_data(idx, 7)
-        before = time.perf_counter()
+        before = time.perf_counter_ns()
         base_test.handle_message(SerialCommand.STATISTICS_STATUS_COMMAND.value, data)
         assert base_test._statistics_updated_at[idx] >= before
 
@@ -223,6 +292,12 @@ class TestHandleMessageStatistics:
             SerialCommand.STATISTICS_STATUS_COMMAND.value, bytes([0x00])
         )
 
+    def test_statistics_truncated_value_not_stored(self, base_test: BaseTest) -> None:
+        """A value field shorter than 4 bytes must not overwrite the counter."""
+        data = self._make_stats_data(0, 42)[:-1]
+        base_test.handle_message(SerialCommand.STATISTICS_STATUS_COMMAND.value, data)
+        assert base_test._statistics_values[0] == 0
+
 
 # ---------------------------------------------------------------------------
 # handle_message — TASK_STATUS_COMMAND
@@ -255,7 +330,7 @@ class TestHandleMessageTask:
         """Task status message updates _task_updated_at."""
         idx = 1
         data = self._make_task_data(idx, 0, 0, 0)
-        before = time.perf_counter()
+        before = time.perf_counter_ns()
         base_test.handle_message(SerialCommand.TASK_STATUS_COMMAND.value, data)
         assert base_test._task_updated_at[idx] >= before
 
@@ -310,6 +385,20 @@ class TestCalculateTestResults:
         expected_p95 = float(np.percentile(list(latencies.values()), 95))
         assert result["latency_p95"] == pytest.approx(expected_p95)
 
+    @pytest.mark.parametrize("count", [1, 2, 7, 255])
+    def test_p95_matches_numpy_percentile(
+        self, base_test: BaseTest, count: int
+    ) -> None:
+        """Selection-based p95 should match np.percentile for any sample count."""
+        rng = np.random.default_rng(count)
+        values = rng.random(count).tolist()
+        base_test.latency_msg_sent = dict.fromkeys(range(count), 0)
+        base_test.latency_msg_received = dict(enumerate(values))
+        result = base_test._calculate_test_results(
+            test=0, samples=count, waiting_time=0.0, bitrate=1.0
+        )
+        assert result["latency_p95"] == pytest.approx(np.percentile(values, 95))
+
     def test_dropped_messages_count(self, base_test: BaseTest) -> None:
         """dropped_messages = len(sent) - len(received)."""
         base_test.latency_msg_sent = {0: 0.0, 1: 0.0, 2: 0.0}
@@ -349,6 +438,36 @@ class TestCalculateTestResults:
         assert "dropped_messages" in result
 
 
+# ---------------------------------------------------------------------------
+# _build_iteration_output
+# ---------------------------------------------------------------------------
+class TestBuildIterationOutput:
+    """Tests for BaseTest._build_iteration_output."""
+
+    def test_merges_results_and_outstanding_fields(self, base_test: BaseTest) -> None:
+        """Record should extend test results with latencies and queue depth."""
+        base_test.latency_msg_received = {0: 0.01, 1: 0.02}
+        snap = {"statistics": {}, "tasks": {}}
+        record = base_test._build_iteration_output(
+            {"test": 0}, [1, 3, 2], 3, 1, snap, snap
+        )
+        assert record["test"] == 0
+        assert record["results"] == [0.01, 0.02]
+        assert record["outstanding_messages"] == [1, 3, 2]
+        assert record["outstanding_max"] == 3
+        assert record["outstanding_final"] == 1
+        assert record["status_before"] is snap
+        assert record["status_after"] is snap
+        assert set(record["status_delta"]) == {"statistics", "tasks"}
+
+    def test_empty_iteration(self, base_test: BaseTest) -> None:
+        """An iteration without echoes yields empty results."""
+        snap = {"statistics": {}, "tasks": {}}
+        record = base_test._build_iteration_output({}, [], 0, 0, snap, snap)
+        assert record["outstanding_max"] == 0
+        assert record["results"] == []
+
+
 # ---------------------------------------------------------------------------
 # _write_output_to_file
 # ---------------------------------------------------------------------------
@@ -356,14 +475,18 @@ class TestWriteOutputToFile:
     """Tests for BaseTest._write_output_to_file."""
 
     def test_writes_json_to_file(self, base_test: BaseTest) -> None:
-        """Must call json.dump with the correct data."""
+        """Must write the serialised envelope in a single call."""
         data = [{"test": 0, "latency_avg": 0.01}]
         m = mock_open()
-        with patch("pathlib.Path.open", m):
+        with (
+            patch("pathlib.Path.open", m),
+            patch("result_format.os.fsync"),
+            patch("pathlib.Path.replace"),
+        ):
             base_test._write_output_to_file(Path("output.json"), data)
         handle = m()
-        written = "".join(call.args[0] for call in handle.write.call_args_list)
-        parsed = json.loads(written)
+        handle.write.assert_called_once()
+        parsed = json.loads(handle.write.call_args.args[0])
         assert parsed["format_type"] == FORMAT_LATENCY_SERIES
         assert parsed["format_version"] == 1
         assert parsed["payload"] == data
@@ -374,6 +497,108 @@ class TestWriteOutputToFile:
             base_test._write_output_to_file(Path("output.json"), [])
 
 
+@pytest.mark.parametrize(
+    ("length", "baudrate", "expected"),
+    [(10, 115200, 140 / 115200), (6, 9600, 100 / 9600)],
+)
+def test_uart_drain_time_s(length: int, baudrate: int, expected: float) -> None:
+    """Wire time counts payload plus framing at 10 bits per byte."""
+    assert uart_drain_time_s(length, baudrate) == pytest.approx(expected)
+
+
+# ---------------------------------------------------------------------------
+# ResultStream
+# ---------------------------------------------------------------------------
+class TestResultStream:
+    """Tests for the streaming result file writer."""
+
+    @pytest.mark.parametrize(
+        "records",
+        [[], [{"test": 0}], [{"test": 0, "results": [0.1, 0.2]}, {"test": 1}]],
+    )
+    def test_matches_single_shot_writer(
+        self, base_test: BaseTest, tmp_path: Path, records: list[dict]
+    ) -> None:
+        """The streamed file must equal the one written in one go."""
+        expected = tmp_path / "expected.json"
+        base_test._write_output_to_file(expected, records)
+
+        streamed = tmp_path / "streamed.json"
+        with ResultStream(streamed) as results:
+            for record in records:
+                results.append(record)
+
+        assert streamed.read_text() == expected.read_text()
+
+    def test_records_streamed_to_tmp_until_close(self, tmp_path: Path) -> None:
+        """Records go to the .tmp sibling; the result file appears on close."""
+        file_path = tmp_path / "out.json"
+        tmp_file = tmp_path / "out.json.tmp"
+        results = ResultStream(file_path)
+        results.append({"test": 0})
+
+        deadline = time.monotonic() + 2.0
+        while not tmp_file.exists() or '"test": 0' not in tmp_file.read_text():
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        assert not file_path.exists()
+        results.close()
+
+        assert not tmp_file.exists()
+        assert json.loads(file_path.read_text())["payload"] == [{"test": 0}]
+
+    def test_oserror_does_not_block_close(self) -> None:
+        """A failing open is logged and close() still returns."""
+        with (
+            patch("pathlib.Path.open", side_effect=OSError("disk full")),
+            patch("base_test.logger") as mock_log,
+        ):
+            results = ResultStream(Path("output.json"))
+            results.append({"test": 0})
+            results.close()
+        mock_log.exception.assert_called_once_with("Error writing to file.")
+
+    def test_unserialisable_record_leaves_no_partial_file(self, tmp_path: Path) -> None:
+        """A record json cannot encode is logged; close() returns, no file left."""
+        file_path = tmp_path / "out.json"
+        with (
+            patch("base_test.logger") as mock_log,
+            ResultStream(file_path) as results,
+        ):
+            results.append({"test": object()})
+            results.append({"test": 1})
+        mock_log.exception.assert_called_once_with("Error writing to file.")
+        assert list(tmp_path.iterdir()) == []
+
+    def test_exception_in_block_leaves_result_unpublished(self, tmp_path: Path) -> None:
+        """An interrupted run never publishes file_path; records stay in .tmp."""
+        file_path = tmp_path / "out.json"
+
+        def interrupted_run() -> None:
+            with ResultStream(file_path) as results:
+                results.append({"test": 0})
+                raise KeyboardInterrupt
+
+        with pytest.raises(KeyboardInterrupt):
+            interrupted_run()
+
+        assert not file_path.exists()
+        partial = (tmp_path / "out.json.tmp").read_text()
+        assert '"test": 0' in partial
+        with pytest.raises(json.JSONDecodeError):
+            json.loads(partial)
+
+    def test_failed_publish_leaves_no_partial_file(self, tmp_path: Path) -> None:
+        """If the rename fails, neither the result nor the .tmp file remains."""
+        file_path = tmp_path / "out.json"
+        with (
+            patch("pathlib.Path.replace", side_effect=OSError("read-only")),
+            ResultStream(file_path) as results,
+        ):
+            results.append({"test": 0})
+        assert list(tmp_path.iterdir()) == []
+
+
 # ---------------------------------------------------------------------------
 # _status_update
 # ---------------------------------------------------------------------------
@@ -408,6 +633,16 @@ class TestStatusUpdate:
         assert written[-1] == 10
         assert len(written) == len(STATISTICS_HEADER_BYTES) + 2
 
+    def test_repeated_requests_reuse_payload(
+        self, base_test: BaseTest, mock_serial: Mock
+    ) -> None:
+        """The same status item should be sent from one cached frame."""
+        base_test._status_update(TASK_HEADER_BYTES, 4)
+        base_test._status_update(TASK_HEADER_BYTES, 4)
+        first, second = (c.args[0] for c in mock_serial.write.call_args_list)
+        assert first is second
+        assert first is status_request_payload(TASK_HEADER_BYTES, 4)
+
 
 # ---------------------------------------------------------------------------
 # _calculate_status_delta
@@ -504,6 +739,42 @@ class TestGetUserInput:
         assert "77" in call_arg
 
 
+# ---------------------------------------------------------------------------
+# _wait_for_echoes
+# ---------------------------------------------------------------------------
+class TestWaitForEchoes:
+    """Tests for BaseTest._wait_for_echoes."""
+
+    def test_returns_immediately_when_all_received(self, base_test: BaseTest) -> None:
+        """No sleep when every sent echo is already back."""
+        base_test.latency_msg_sent = {0: 1, 1: 2}
+        base_test.latency_msg_received = {0: 0.001, 1: 0.002}
+        with patch("base_test.time.sleep") as mock_sleep:
+            base_test._wait_for_echoes(3.0)
+        mock_sleep.assert_not_called()
+
+    def test_returns_once_last_echo_arrives(self, base_test: BaseTest) -> None:
+        """Polling stops as soon as the outstanding echo is received."""
+        base_test.latency_msg_sent = {0: 1}
+
+        def fake_sleep(_s: float) -> None:
+            base_test.latency_msg_received[0] = 0.001
+
+        with patch("base_test.time.sleep", side_effect=fake_sleep) as mock_sleep:
+            base_test._wait_for_echoes(3.0)
+        mock_sleep.assert_called_once()
+
+    def test_gives_up_at_timeout(self, base_test: BaseTest) -> None:
+        """Missing echoes do not extend the wait past the timeout."""
+        base_test.latency_msg_sent = {0: 1}
+        with (
+            patch("base_test.time.sleep") as mock_sleep,
+            patch("base_test.time.perf_counter", side_effect=[100.0, 100.5, 103.0]),
+        ):
+            base_test._wait_for_echoes(3.0)
+        mock_sleep.assert_called_once()
+
+
 # ---------------------------------------------------------------------------
 # _request_status_snapshot
 # ---------------------------------------------------------------------------
@@ -530,7 +801,6 @@ class TestRequestStatusSnapshot:
             patch(
                 "base_test.time.perf_counter",
                 side_effect=[
-                    100.0,  # snapshot_marker
                     100.0,  # deadline = perf_counter() + timeout_s
                     200.0,  # first while check -> exceeds deadline, exit loop
                     200.0,  # (any extra calls)
@@ -550,29 +820,27 @@ class TestRequestStatusSnapshot:
 
     def test_complete_when_all_responses_received(self, base_test: BaseTest) -> None:
         """Should return complete=True when all items respond before deadline."""
-        marker_time = 100.0
+        marker_ns = 100_000_000_000
 
         # Pre-populate all timestamps as if responses came back after marker
         for idx in STATISTICS_ITEMS:
-            base_test._statistics_updated_at[idx] = marker_time + 0.5
+            base_test._statistics_updated_at[idx] = marker_ns + 500_000_000
         for idx in TASK_ITEMS:
-            base_test._task_updated_at[idx] = marker_time + 0.5
+            base_test._task_updated_at[idx] = marker_ns + 500_000_000
 
         call_count = [0]
 
         def fake_perf_counter() -> float:
             call_count[0] += 1
-            # First call: snapshot_marker
+            # First call: deadline calculation
             if call_count[0] == 1:
-                return marker_time
-            # Second call: deadline calculation
-            if call_count[0] == 2:
-                return marker_time + 0.01
+                return 100.01
             # Subsequent: within deadline so the loop checks and finds complete
-            return marker_time + 0.02
+            return 100.02
 
         with (
             patch("base_test.time.sleep", return_value=None),
+            patch("base_test.time.perf_counter_ns", return_value=marker_ns),
             patch("base_test.time.perf_counter", side_effect=fake_perf_counter),
         ):
             result = base_test._request_status_snapshot(timeout_s=5.0)
@@ -583,25 +851,24 @@ class TestRequestStatusSnapshot:
 
     def test_incomplete_when_timeout_exceeded(self, base_test: BaseTest) -> None:
         """Should return complete=False when timeout expires with partial responses."""
-        marker_time = 100.0
+        marker_ns = 100_000_000_000
 
         # Only update a subset of statistics timestamps
         for idx in list(STATISTICS_ITEMS.keys())[:5]:
-            base_test._statistics_updated_at[idx] = marker_time + 0.5
+            base_test._statistics_updated_at[idx] = marker_ns + 500_000_000
 
         call_count = [0]
 
         def fake_perf_counter() -> float:
             call_count[0] += 1
             if call_count[0] == 1:
-                return marker_time
-            if call_count[0] == 2:
-                return marker_time + 0.01
+                return 100.01
             # Immediately exceed deadline
-            return marker_time + 10.0
+            return 110.0
 
         with (
             patch("base_test.time.sleep", return_value=None),
+            patch("base_test.time.perf_counter_ns", return_value=marker_ns),
             patch("base_test.time.perf_counter", side_effect=fake_perf_counter),
         ):
             result = base_test._request_status_snapshot(timeout_s=1.0)
@@ -621,7 +888,6 @@ class TestRequestStatusSnapshot:
             patch(
                 "base_test.time.perf_counter",
                 side_effect=[
-                    100.0,
                     100.0,
                     200.0,
                     200.0,
@@ -646,7 +912,6 @@ class TestRequestStatusSnapshot:
             patch(
                 "base_test.time.perf_counter",
                 side_effect=[
-                    100.0,
                     100.0,
                     200.0,
                     200.0,
@@ -706,7 +971,7 @@ class TestEchoLatencyBounds:
     def test_echo_latency_is_positive_and_bounded(self, base_test: BaseTest) -> None:
         """Echo latency should be > 0 and < 1.0 second."""
         counter = 10
-        base_test.latency_msg_sent[counter] = time.perf_counter() - 0.005
+        base_test.latency_msg_sent[counter] = time.perf_counter_ns() - 5_000_000
         data = self._make_echo_data(counter)
         base_test.handle_message(SerialCommand.ECHO_COMMAND.value, data)
         latency = base_test.latency_msg_received[counter]
@@ -718,7 +983,7 @@ class TestEchoLatencyBounds:
     ) -> None:
         """Latency should approximately reflect the time delta from send."""
         counter = 20
-        base_test.latency_msg_sent[counter] = time.perf_counter() - 0.050
+        base_test.latency_msg_sent[counter] = time.perf_counter_ns() - 50_000_000
         data = self._make_echo_data(counter)
         base_test.handle_message(SerialCommand.ECHO_COMMAND.value, data)
         latency = base_test.latency_msg_received[counter]
@@ -789,7 +1054,11 @@ class TestWriteOutputEncoding:
         """open() should be called with encoding='utf-8'."""
         data = [{"test": 0}]
         m = mock_open()
-        with patch("pathlib.Path.open", m):
+        with (
+            patch("pathlib.Path.open", m),
+            patch("result_format.os.fsync"),
+            patch("pathlib.Path.replace"),
+        ):
             base_test._write_output_to_file(Path("output.json"), data)
         m.assert_called_once_with("w", encoding="utf-8")
 
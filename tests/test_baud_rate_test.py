@@ -6,6 +6,8 @@ import logging
 from typing import Any
 from unittest.mock import Mock, patch
 
+import pytest
+
 from base_test import (
     DEFAULT_MESSAGE_LENGTH,
     DEFAULT_SAMPLES,
@@ -85,6 +87,50 @@ def test_baud_rate_test_sweeps_rates_and_writes_output() -> None:
         assert "complete" in item["status_before"]
 
 
+def test_baud_rate_test_sends_on_absolute_deadlines() -> None:
+    """Publish time should not stretch the spacing between baud sweep sends."""
+    mock_ser = Mock(spec=SerialInterface)
+    mock_ser.baudrate = 115200
+    mock_ser.set_baudrate = Mock(return_value=True)
+    mock_ser.set_message_handler = Mock()
+    tester = BaudRateTest(mock_ser)
+
+    class DummyBar:
+        def __init__(self, *_: Any, **__: Any) -> None: ...
+
+        def __enter__(self) -> Any:
+            return lambda: None
+
+        def __exit__(self, *_: object) -> None:
+            return None
+
+    now = {"t": 0.0}
+    send_times: list[float] = []
+
+    def fake_sleep(seconds: float) -> None:
+        now["t"] += seconds
+
+    def fake_publish(_i: int, _length: int) -> None:
+        send_times.append(now["t"])
+        now["t"] += 0.03
+
+    with (
+        patch("baud_rate_test.alive_bar", DummyBar),
+        patch("baud_rate_test.time.sleep", fake_sleep),
+        patch("baud_rate_test.time.perf_counter", lambda: now["t"]),
+        patch.object(tester, "publish", fake_publish),
+        patch.object(tester, "_request_status_snapshot", return_value={}),
+        patch.object(tester, "_calculate_status_delta", return_value={}),
+        patch.object(tester, "_wait_for_echoes"),
+        patch.object(BaudRateTest, "_write_output_to_file"),
+    ):
+        # 6-byte messages at 1000 baud take 0.1 s on the wire.
+        tester.baud_rate_test(baud_rates=[1000], samples=4, wait_time=0.0, length=6)
+
+    offsets = [t - send_times[0] for t in send_times]
+    assert offsets == pytest.approx([0.0, 0.1, 0.2, 0.3])
+
+
 def test_baud_rate_test_skips_failed_baudrate() -> None:
     """baud_rate_test skips rates where set_baudrate fails."""
     mock_ser = Mock(spec=SerialInterface)
@@ -5,39 +5,56 @@ from checksum import calculate_checksum
 
 def test_empty_data() -> None:
     """Test that the checksum of an empty byte string is 0."""
-    assert calculate_checksum(b"") == b"\x00"
+    assert calculate_checksum(b"") == 0x00
 
 
 def test_single_byte() -> None:
     """Test that the checksum of a single byte is the byte itself."""
-    assert calculate_checksum(b"\x01") == b"\x01"
+    assert calculate_checksum(b"\x01") == 0x01
 
 
 def test_multiple_bytes() -> None:
     """Test that the checksum is calculated correctly for multiple bytes."""
-    assert calculate_checksum(b"\x01\x02\x03") == b"\x00"
+    assert calculate_checksum(b"\x01\x02\x03") == 0x00
 
 
 def test_zero_bytes() -> None:
     """Test that the checksum is calculated correctly for zero bytes."""
-    assert calculate_checksum(b"\x00\x00\x00") == b"\x00"
+    assert calculate_checksum(b"\x00\x00\x00") == 0x00
 
 
 def test_all_ones() -> None:
     """Test that the checksum is calculated correctly for all ones."""
-    assert calculate_checksum(b"\xff\xff\xff") == b"\xff"
+    assert calculate_checksum(b"\xff\xff\xff") == 0xFF
 
 
 def test_alternating_bits() -> None:
     """Test that the checksum is calculated correctly for alternating bits."""
-    assert calculate_checksum(b"\xaa\x55") == b"\xff"
+    assert calculate_checksum(b"\xaa\x55") == 0xFF
 
 
 def test_typical_message() -> None:
     """Test that the checksum is calculated correctly for a typical message."""
-    assert calculate_checksum(b"Hello World") == b"\x20"
+    assert calculate_checksum(b"Hello World") == 0x20
 
 
 def test_binary_data() -> None:
     """Test that the checksum is calculated correctly for binary data."""
-    assert calculate_checksum(bytes([0x12, 0x34, 0x56, 0x78])) == b"\x08"
+    assert calculate_checksum(bytes([0x12, 0x34, 0x56, 0x78])) == 0x08
+
+
+def test_memoryview_slice() -> None:
+    """Test that a memoryview slice is checksummed without copying."""
+    frame = bytes([0x12, 0x34, 0x56, 0x78, 0x08])
+    assert calculate_checksum(memoryview(frame)[:-1]) == frame[-1]
+
+
+def test_long_buffer_matches_bytewise_xor() -> None:
+    """Test that buffers on the word-fold path match the per-byte XOR."""
+    for size in (63, 64, 65, 127, 1024, 1031):
+        data = bytes((i * 37 + 11) & 0xFF for i in range(size))
+        expected = 0
+        for byte in data:
+            expected ^= byte
+        assert calculate_checksum(data) == expected
+        assert calculate_checksum(memoryview(data)) == expected
@@ -25,6 +25,14 @@ def command_mode(mock_serial: Mock) -> CommandMode:
     return CommandMode(mock_serial)
 
 
+def _queued_output(command_mode: CommandMode) -> list[str]:
+    """Drain and return the text queued for the output writer thread."""
+    items: list[str] = []
+    while not command_mode._output_queue.empty():
+        items.append(command_mode._output_queue.get_nowait())
+    return items
+
+
 # ---------------------------------------------------------------------------
 # __init__
 # ---------------------------------------------------------------------------
@@ -37,10 +45,6 @@ class TestCommandModeInit:
         """serial_interface should be stored upon construction."""
         assert command_mode.serial_interface is mock_serial
 
-    def test_message_queue_is_empty(self, command_mode: CommandMode) -> None:
-        """message_queue should be empty on init."""
-        assert command_mode.message_queue.empty()
-
     def test_running_starts_false(self, command_mode: CommandMode) -> None:
         """Running should be False on init."""
         assert command_mode.running is False
@@ -60,27 +64,6 @@ class TestCommandModeInit:
 class TestHandleMessage:
     """Tests for CommandMode.handle_message."""
 
-    def test_puts_message_in_queue(self, command_mode: CommandMode) -> None:
-        """handle_message should enqueue the (command, data, bytes) tuple."""
-        command_mode.handle_message(1, b"data", b"raw")
-        assert not command_mode.message_queue.empty()
-        item = command_mode.message_queue.get_nowait()
-        assert item == (1, b"data", b"raw")
-
-    def test_multiple_messages_queued_in_order(self, command_mode: CommandMode) -> None:
-        """Multiple messages should be enqueued in FIFO order."""
-        command_mode.handle_message(1, b"a", b"ra")
-        command_mode.handle_message(2, b"b", b"rb")
-        assert command_mode.message_queue.get_nowait() == (1, b"a", b"ra")
-        assert command_mode.message_queue.get_nowait() == (2, b"b", b"rb")
-
-
-# ---------------------------------------------------------------------------
-# _handle_message — internal handler
-# ---------------------------------------------------------------------------
-class TestInternalHandleMessage:
-    """Tests for CommandMode._handle_message."""
-
     def _valid_data(self, command_val: int) -> bytes:
         """Build a minimal decoded_data for the given command value."""
         # byte[1] holds (rxid << 5 | command); we want command low 5 bits
@@ -92,33 +75,101 @@ class TestInternalHandleMessage:
         with (
             patch("sys.stdout", new_callable=StringIO) as mock_stdout,
             patch.object(command_mode, "_print_decoded_message") as mock_print,
-            patch("command_mode.cobs.decode", return_value=b"\x00\x04\x01\x00\x00\x00"),
         ):
-            command_mode._handle_message(
+            command_mode.handle_message(
                 SerialCommand.ANALOG_COMMAND.value,
                 self._valid_data(SerialCommand.ANALOG_COMMAND.value),
                 b"raw",
             )
         mock_print.assert_not_called()
 
+    def test_analog_command_queues_no_output(self, command_mode: CommandMode) -> None:
+        """ANALOG_COMMAND should return without queuing any output."""
+        command_mode.handle_message(
+            SerialCommand.ANALOG_COMMAND.value,
+            self._valid_data(SerialCommand.ANALOG_COMMAND.value),
+            b"raw",
+        )
+        assert _queued_output(command_mode) == []
+
     def test_non_analog_calls_print_decoded(self, command_mode: CommandMode) -> None:
         """Non-analog commands should call _print_decoded_message."""
         with (
             patch("sys.stdout", new_callable=StringIO),
             patch.object(command_mode, "_print_decoded_message") as mock_print,
-            patch(
-                "command_mode.cobs.decode",
-                return_value=self._valid_data(SerialCommand.ECHO_COMMAND.value),
-            ),
-            patch("command_mode.calculate_checksum", return_value=b"\x00"),
+            patch("command_mode.calculate_checksum", return_value=0),
         ):
-            command_mode._handle_message(
+            command_mode.handle_message(
                 SerialCommand.ECHO_COMMAND.value,
                 self._valid_data(SerialCommand.ECHO_COMMAND.value),
                 b"raw",
             )
         mock_print.assert_called_once()
 
+    def test_prompt_redrawn_with_single_write(self, command_mode: CommandMode) -> None:
+        """Clearing and reprinting the prompt should be one queued write."""
+        command_mode.current_input = "AB"
+        command_mode._writer_active = True
+        with (
+            patch.object(command_mode, "_print_decoded_message"),
+            patch("command_mode.logger") as mock_log,
+        ):
+            mock_log.isEnabledFor.return_value = False
+            command_mode.handle_message(
+                SerialCommand.ECHO_COMMAND.value,
+                self._valid_data(SerialCommand.ECHO_COMMAND.value),
+                b"raw",
+            )
+        width = len(command_mode.prompt) + 2
+        assert _queued_output(command_mode) == [
+            "\r" + " " * width + "\r" + command_mode.prompt + "AB"
+        ]
+
+    def test_no_output_queued_without_active_writer(
+        self, command_mode: CommandMode
+    ) -> None:
+        """Frames arriving outside command mode must not queue prompt redraws."""
+        with patch("command_mode.logger") as mock_log:
+            mock_log.isEnabledFor.return_value = True
+            command_mode.handle_message(
+                SerialCommand.ECHO_COMMAND.value,
+                self._valid_data(SerialCommand.ECHO_COMMAND.value),
+                b"raw",
+            )
+        assert _queued_output(command_mode) == []
+
+    def test_info_disabled_skips_decode(self, command_mode: CommandMode) -> None:
+        """With INFO disabled, the checksum should not be computed or printed."""
+        with (
+            patch("sys.stdout", new_callable=StringIO),
+            patch.object(command_mode, "_print_decoded_message") as mock_print,
+            patch("command_mode.calculate_checksum") as mock_checksum,
+            patch("command_mode.logger") as mock_log,
+        ):
+            mock_log.isEnabledFor.return_value = False
+            command_mode.handle_message(
+                SerialCommand.ECHO_COMMAND.value,
+                self._valid_data(SerialCommand.ECHO_COMMAND.value),
+                b"raw",
+            )
+        mock_checksum.assert_not_called()
+        mock_print.assert_not_called()
+
+    def test_checksum_computed_from_decoded_frame(
+        self, command_mode: CommandMode
+    ) -> None:
+        """The checksum is checked on decoded_data without decoding again."""
+        frame = bytes([0x00, 0x01, 0x02, 0x0A, 0x0B])
+        with (
+            patch("sys.stdout", new_callable=StringIO),
+            patch.object(command_mode, "_print_decoded_message"),
+            patch("command_mode.calculate_checksum", return_value=0) as mock_checksum,
+        ):
+            command_mode.handle_message(
+                SerialCommand.ECHO_COMMAND.value, frame, b"not-cobs"
+            )
+        assert bytes(mock_checksum.call_args.args[0]) == frame[:-1]
+
 
 # ---------------------------------------------------------------------------
 # _print_decoded_message
@@ -159,7 +210,70 @@ class TestPrintDecodedMessage:
             mock_log.info.side_effect = lambda msg, *args: logged.append(msg % args)
             command_mode._print_decoded_message(data)
         combined = " ".join(logged)
-        assert "Decoded message:" in combined
+        assert "Decoded message: 00 00 01 00 00 00," in combined
+
+    def test_key_frame_fields_decoded(self, command_mode: CommandMode) -> None:
+        """Keypad frames should log the unpacked column, row and state."""
+        key_cmd = SerialCommand.KEY_COMMAND.value
+        data = bytes([0x00, 0x20 | key_cmd, 0x04, 0b0100_0111])
+        with patch("command_mode.logger") as mock_log:
+            command_mode._print_decoded_message(data)
+        msg, *args = mock_log.info.call_args[0]
+        logged = msg % tuple(args)
+        assert f"Id: 1, Command: {key_cmd}" in logged
+        assert "Column: 4, Row: 3, State: 1, Length: 4" in logged
+
+    def test_single_log_call_with_decoded_fields(
+        self, command_mode: CommandMode
+    ) -> None:
+        """Header and analog payload should be decoded into one log record."""
+        analog_cmd = SerialCommand.ANALOG_COMMAND.value
+        data = bytes([0x01, 0x40 | analog_cmd, 0x03, 0x03, 0x01, 0x02])
+        with patch("command_mode.logger") as mock_log:
+            command_mode._print_decoded_message(data)
+        mock_log.info.assert_called_once()
+        msg, *args = mock_log.info.call_args[0]
+        logged = msg % tuple(args)
+        assert f"Id: 10, Command: {analog_cmd}" in logged
+        assert "Channel: 3, Value: 258" in logged
+
+    def test_frame_shorter_than_header_logged_invalid(
+        self, command_mode: CommandMode
+    ) -> None:
+        """A frame shorter than the header is reported instead of raising."""
+        with patch("command_mode.logger") as mock_log:
+            command_mode._print_decoded_message(b"\x00\x21")
+        mock_log.info.assert_called_once_with("Invalid message")
+
+    @pytest.mark.parametrize(
+        "command",
+        [SerialCommand.KEY_COMMAND.value, SerialCommand.ANALOG_COMMAND.value],
+    )
+    def test_truncated_frame_logged_invalid(
+        self, command_mode: CommandMode, command: int
+    ) -> None:
+        """Key and analog frames cut short after the header are reported."""
+        with patch("command_mode.logger") as mock_log:
+            command_mode._print_decoded_message(bytes([0x00, command, 0x04]))
+        mock_log.info.assert_called_once_with("Invalid message")
+
+    def test_analog_frame_missing_value_logged_invalid(
+        self, command_mode: CommandMode
+    ) -> None:
+        """An analog frame without its full 16-bit value is reported."""
+        analog_cmd = SerialCommand.ANALOG_COMMAND.value
+        with patch("command_mode.logger") as mock_log:
+            command_mode._print_decoded_message(bytes([0x00, analog_cmd, 3, 3, 1]))
+        mock_log.info.assert_called_once_with("Invalid message")
+
+    def test_handle_message_two_byte_frame_does_not_raise(
+        self, command_mode: CommandMode
+    ) -> None:
+        """A 2-byte frame reaching handle_message must not escape as an error."""
+        with patch("command_mode.logger") as mock_log:
+            mock_log.isEnabledFor.return_value = True
+            command_mode.handle_message(0x01, b"\x00\x21", b"\x03\x21\x00")
+        mock_log.info.assert_any_call("Invalid message")
 
 
 # ---------------------------------------------------------------------------
@@ -184,7 +298,6 @@ class TestExecuteCommandMode:
         with (
             patch.object(command_mode, "_print_prompt"),
             patch.object(command_mode, "_get_input", return_value="x"),
-            patch.object(command_mode, "_process_messages"),
         ):
             command_mode.running = True
             command_mode.execute_command_mode()
@@ -209,57 +322,43 @@ class TestExecuteCommandMode:
         assert events[0] is True
 
 
-# ---------------------------------------------------------------------------
-# _process_messages
-# ---------------------------------------------------------------------------
-class TestProcessMessages:
-    """Tests for CommandMode._process_messages."""
-
-    def test_calls_handle_message_from_queue(self, command_mode: CommandMode) -> None:
-        """_process_messages should dispatch queued messages to _handle_message."""
-
-        def stop_after_one() -> None:
-            command_mode.running = False
-
-        command_mode.running = True
-        command_mode.message_queue.put((1, b"data", b"raw"))
-
-        with patch.object(command_mode, "_handle_message") as mock_handle:
-            # Stop running after first message
-            mock_handle.side_effect = lambda *_: stop_after_one()
-            command_mode._process_messages()
-
-        mock_handle.assert_called_once_with(1, b"data", b"raw")
-
-
 # ---------------------------------------------------------------------------
 # _print_prompt
 # ---------------------------------------------------------------------------
 class TestPrintPrompt:
     """Direct tests for CommandMode._print_prompt."""
 
-    def test_stdout_write_called_with_prompt(self, command_mode: CommandMode) -> None:
-        """sys.stdout.write should be called with self.prompt."""
+    def test_prompt_queued_for_writer(self, command_mode: CommandMode) -> None:
+        """The prompt should be queued for the output writer thread."""
         with patch("sys.stdout") as mock_stdout:
             command_mode._print_prompt()
-        mock_stdout.write.assert_called_once_with(command_mode.prompt)
+        mock_stdout.write.assert_not_called()
+        assert _queued_output(command_mode) == [command_mode.prompt]
 
-    def test_stdout_flush_called(self, command_mode: CommandMode) -> None:
-        """sys.stdout.flush() should be called after writing prompt."""
+
+# ---------------------------------------------------------------------------
+# _output_writer
+# ---------------------------------------------------------------------------
+class TestOutputWriter:
+    """Direct tests for CommandMode._output_writer."""
+
+    def test_writes_and_flushes_until_sentinel(self, command_mode: CommandMode) -> None:
+        """Queued text should be written and flushed in order until None."""
+        command_mode._print_prompt()
+        command_mode._write("AB")
+        command_mode._output_queue.put(None)
         with patch("sys.stdout") as mock_stdout:
-            command_mode._print_prompt()
-        mock_stdout.flush.assert_called_once()
-
-    def test_input_lock_acquired(self, command_mode: CommandMode) -> None:
-        """input_lock should be acquired during _print_prompt."""
-        mock_lock = Mock()
-        mock_lock.__enter__ = Mock(return_value=None)
-        mock_lock.__exit__ = Mock(return_value=False)
-        command_mode.input_lock = mock_lock
-        with patch("sys.stdout"):
-            command_mode._print_prompt()
-        mock_lock.__enter__.assert_called_once()
-        mock_lock.__exit__.assert_called_once()
+            command_mode._output_writer()
+        assert [c.args[0] for c in mock_stdout.write.call_args_list] == [
+            command_mode.prompt,
+            "AB",
+        ]
+        assert mock_stdout.flush.call_count == 2
+
+    def test_empty_text_not_queued(self, command_mode: CommandMode) -> None:
+        """Empty strings should not wake the writer thread."""
+        command_mode._write("")
+        assert _queued_output(command_mode) == []
 
 
 # ---------------------------------------------------------------------------
@@ -272,10 +371,9 @@ class TestGetInput:
         """Characters should accumulate and be returned on newline."""
         command_mode.running = True
         with (
-            patch("sys.stdin") as mock_stdin,
+            patch.object(command_mode, "_read_stdin_chunk", side_effect=["ab", "c\n"]),
             patch("sys.stdout"),
         ):
-            mock_stdin.read.side_effect = ["a", "b", "c", "\n"]
             result = command_mode._get_input()
         assert result == "abc"
 
@@ -283,13 +381,76 @@ class TestGetInput:
         r"""Backspace (\x7f) should remove last char and write '\b \b'."""
         command_mode.running = True
         with (
-            patch("sys.stdin") as mock_stdin,
-            patch("sys.stdout") as mock_stdout,
+            patch.object(command_mode, "_read_stdin_chunk", side_effect=["ab\x7f\n"]),
         ):
-            mock_stdin.read.side_effect = ["a", "b", "\x7f", "\n"]
             result = command_mode._get_input()
         assert result == "a"
-        mock_stdout.write.assert_any_call("\b \b")
+        assert _queued_output(command_mode) == ["ab\b \b"]
+
+    def test_pasted_lines_are_returned_one_at_a_time(
+        self, command_mode: CommandMode
+    ) -> None:
+        """Text after the first newline should be kept for the next call."""
+        command_mode.running = True
+        with (
+            patch.object(command_mode, "_read_stdin_chunk", side_effect=["01\n02\n"]),
+            patch("sys.stdout"),
+        ):
+            first = command_mode._get_input()
+            second = command_mode._get_input()
+        assert (first, second) == ("01", "02")
+
+    def test_read_stdin_chunk_reads_ready_line(self, command_mode: CommandMode) -> None:
+        """Ready tty input is read through sys.stdin, not the raw fd."""
+        with (
+            patch("command_mode.os.name", "posix"),
+            patch("command_mode.select.select", return_value=([1], [], [])),
+            patch("command_mode.sys.stdin") as mock_stdin,
+        ):
+            mock_stdin.isatty.return_value = True
+            mock_stdin.readline.return_value = "0102\n"
+            assert command_mode._read_stdin_chunk() == "0102\n"
+        mock_stdin.readline.assert_called_once()
+
+    def test_read_stdin_chunk_times_out(self, command_mode: CommandMode) -> None:
+        """No ready tty input should return an empty string without reading."""
+        with (
+            patch("command_mode.os.name", "posix"),
+            patch("command_mode.select.select", return_value=([], [], [])),
+            patch("command_mode.sys.stdin") as mock_stdin,
+        ):
+            mock_stdin.isatty.return_value = True
+            assert command_mode._read_stdin_chunk() == ""
+        mock_stdin.readline.assert_not_called()
+
+    @pytest.mark.parametrize(("os_name", "isatty"), [("nt", True), ("posix", False)])
+    def test_read_stdin_chunk_without_select(
+        self, command_mode: CommandMode, os_name: str, *, isatty: bool
+    ) -> None:
+        """Windows and non-tty stdin read a line without calling select."""
+        with (
+            patch("command_mode.os.name", os_name),
+            patch("command_mode.select.select") as mock_select,
+            patch("command_mode.sys.stdin") as mock_stdin,
+        ):
+            mock_stdin.isatty.return_value = isatty
+            mock_stdin.readline.return_value = "01\n"
+            assert command_mode._read_stdin_chunk() == "01\n"
+        mock_select.assert_not_called()
+
+    def test_read_stdin_chunk_eof_stops_running(
+        self, command_mode: CommandMode
+    ) -> None:
+        """End of input should stop the command loop."""
+        command_mode.running = True
+        with (
+            patch("command_mode.os.name", "posix"),
+            patch("command_mode.sys.stdin") as mock_stdin,
+        ):
+            mock_stdin.isatty.return_value = False
+            mock_stdin.readline.return_value = ""
+            assert command_mode._read_stdin_chunk() == ""
+        assert command_mode.running is False
 
     def test_empty_return_when_not_running(self, command_mode: CommandMode) -> None:
         """When running=False, _get_input should return empty string."""
@@ -384,7 +545,6 @@ class TestExecuteCommandModeAdditional:
         with (
             patch.object(command_mode, "_print_prompt"),
             patch.object(command_mode, "_get_input", side_effect=fake_get_input),
-            patch.object(command_mode, "_process_messages"),
         ):
             command_mode.execute_command_mode()
 
@@ -398,7 +558,6 @@ class TestExecuteCommandModeAdditional:
         with (
             patch.object(command_mode, "_print_prompt"),
             patch.object(command_mode, "_get_input", side_effect=KeyboardInterrupt),
-            patch.object(command_mode, "_process_messages"),
         ):
             command_mode.execute_command_mode()
 
@@ -409,7 +568,6 @@ class TestExecuteCommandModeAdditional:
         with (
             patch.object(command_mode, "_print_prompt"),
             patch.object(command_mode, "_get_input", return_value="X"),
-            patch.object(command_mode, "_process_messages"),
         ):
             command_mode.execute_command_mode()
 
@@ -297,3 +297,10 @@ def test_fmt_ts_returns_string(monitor: KeypadAdcMonitor) -> None:
     result = monitor._fmt_ts(time.time())
     assert isinstance(result, str)
     assert len(result) > 0
+
+
+def test_fmt_ts_formats_utc_with_millis(monitor: KeypadAdcMonitor) -> None:
+    """_fmt_ts renders HH:MM:SS.mmm in UTC."""
+    # 2025-03-15 10:30:45.123 UTC
+    assert monitor._fmt_ts(1742034645.123) == "10:30:45.123"
+    assert monitor._fmt_ts(1742034646.0) == "10:30:46.000"
@@ -21,6 +21,7 @@ from base_test import (
 from latency_test import (
     DEFAULT_MIN_WAIT,
     DEFAULT_NUM_TIMES,
+    SLEEP_SPIN_MARGIN_S,
     LatencyTest,
 )
 from result_format import FORMAT_LATENCY_SERIES
@@ -43,13 +44,11 @@ def test_publish_builds_correct_payload_and_records_time(
     counter = 5
     message_length = 8
 
-    with patch("base_test.time.perf_counter", return_value=123.456):
+    with patch("base_test.time.perf_counter_ns", return_value=123_456):
         latency_tester.publish(counter, message_length)
 
     # Verify time recorded after write and flush
-    assert pytest.approx(latency_tester.latency_msg_sent[counter]) == pytest.approx(
-        123.456
-    )
+    assert latency_tester.latency_msg_sent[counter] == 123_456
 
     # Verify payload structure sent to serial, followed by flush
     assert ser_mock.write.call_count == 1
@@ -162,11 +161,11 @@ def test_write_output_to_file_oserror_logs(caplog: pytest.LogCaptureFixture) ->
 def test_handle_message_valid_updates_latency(latency_tester: LatencyTest) -> None:
     """handle_message computes latency and stores it by counter."""
     counter = 7
-    # Simulate that the message with this counter was sent at t=1.0
-    latency_tester.latency_msg_sent[counter] = 1.0
+    # Simulate that the message with this counter was sent at t=1.0 s
+    latency_tester.latency_msg_sent[counter] = 1_000_000_000
 
-    # perf_counter now returns 2.5, so latency should be 1.5
-    with patch("base_test.time.perf_counter", return_value=2.5):
+    # perf_counter_ns now returns 2.5 s, so latency should be 1.5 s
+    with patch("base_test.time.perf_counter_ns", return_value=2_500_000_000):
         latency_tester.handle_message(
             SerialCommand.ECHO_COMMAND.value, b"\x00\x00\x00\x00\x07"
         )
@@ -176,8 +175,8 @@ def test_handle_message_valid_updates_latency(latency_tester: LatencyTest) -> No
     )
 
 
-def test_handle_message_index_error_logged(caplog: pytest.LogCaptureFixture) -> None:
-    """handle_message logs on malformed data (IndexError)."""
+def test_handle_message_short_echo_logged(caplog: pytest.LogCaptureFixture) -> None:
+    """handle_message logs on an echo too short to hold the counter."""
     tester = LatencyTest(Mock(spec=SerialInterface))
 
     with caplog.at_level(logging.INFO):
@@ -185,7 +184,7 @@ def test_handle_message_index_error_logged(caplog: pytest.LogCaptureFixture) ->
         logger.addHandler(caplog.handler)
         tester.handle_message(SerialCommand.ECHO_COMMAND.value, b"\x01\x02")
         logger.removeHandler(caplog.handler)
-    assert "Invalid message (Index Error)" in caplog.text
+    assert "Invalid echo message" in caplog.text
 
 
 def test_get_user_input_default_and_casting() -> None:
@@ -282,6 +281,7 @@ def test_execute_test_with_options_calls_main_test() -> None:
             samples=10,
             length=8,
             jitter=True,
+            pipeline_depth=3,
         )
     mock_main.assert_called_once_with(
         num_times=2,
@@ -291,6 +291,7 @@ def test_execute_test_with_options_calls_main_test() -> None:
         samples=10,
         length=8,
         jitter=True,
+        pipeline_depth=3,
     )
 
 
@@ -316,19 +317,13 @@ def test_main_test_collects_and_writes_output() -> None:
         t["v"] += 0.01
         return t["v"]
 
-    captured: dict[str, Any] = {}
-
-    def fake_write(file_path: Path, output_data: list[dict[str, Any]]) -> None:
-        captured["file_path"] = file_path
-        captured["data"] = output_data
-
     with (
         patch("latency_test.alive_bar", DummyBar),
         patch("latency_test.time.sleep", lambda _x: None),
         patch("latency_test.time.perf_counter", side_effect=fake_perf_counter),
         patch("base_test.time.perf_counter", side_effect=fake_perf_counter),
         patch("base_test.time.sleep", lambda _x: None),
-        patch.object(LatencyTest, "_write_output_to_file", side_effect=fake_write),
+        patch("latency_test.ResultStream") as mock_stream,
     ):
         tester.main_test(
             num_times=2,
@@ -341,12 +336,10 @@ def test_main_test_collects_and_writes_output() -> None:
         )
 
     # Validate structure of written data
-    assert "file_path" in captured
-    assert re.match(
-        r"^\d{8}-\d{6}-[0-9a-f]{8}-latency\.json$", captured["file_path"].name
-    )
-    assert "data" in captured
-    out = captured["data"]
+    results = mock_stream.return_value.__enter__.return_value
+    file_path = mock_stream.call_args.args[0]
+    assert re.match(r"^\d{8}-\d{6}-[0-9a-f]{8}-latency\.json$", file_path.name)
+    out = [c.args[0] for c in results.append.call_args_list]
     assert isinstance(out, list)
     assert len(out) == 2
     for item in out:
@@ -371,7 +364,7 @@ def test_main_test_collects_and_writes_output() -> None:
 
 
 def test_main_test_with_jitter_path() -> None:
-    """main_test with jitter=True exercises the random.uniform sleep path."""
+    """main_test with jitter=True exercises the jittered send-interval path."""
     mock_ser = Mock(spec=SerialInterface)
     mock_ser.baudrate = 115200
     tester = LatencyTest(mock_ser)
@@ -396,9 +389,10 @@ def test_main_test_with_jitter_path() -> None:
         patch("latency_test.time.perf_counter", side_effect=fake_perf_counter),
         patch("base_test.time.perf_counter", side_effect=fake_perf_counter),
         patch("base_test.time.sleep", lambda _x: None),
-        patch("latency_test.random.uniform", return_value=0.0),
-        patch.object(LatencyTest, "_write_output_to_file"),
+        patch("latency_test.ResultStream"),
+        patch("latency_test.np.random.default_rng") as mock_rng,
     ):
+        mock_rng.return_value.uniform.return_value = np.zeros((2, 2))
         tester.main_test(
             num_times=2,
             samples=2,
@@ -409,6 +403,76 @@ def test_main_test_with_jitter_path() -> None:
             length=6,
         )
 
+    # One vectorised draw for the whole run, one row per burst.
+    uniform = mock_rng.return_value.uniform
+    uniform.assert_called_once()
+    assert uniform.call_args.args == (0, pytest.approx(0.02), (2, 2))
+
+
+@pytest.mark.parametrize(
+    ("pipeline_depth", "expected_offsets"),
+    [(1, [0.0, 1.0, 2.0, 3.0]), (2, [0.0, 0.25, 1.0, 2.0])],
+)
+def test_main_test_sends_on_absolute_deadlines(
+    pipeline_depth: int, expected_offsets: list[float]
+) -> None:
+    """Publish time should not push later sends off the deadline grid."""
+    mock_ser = Mock(spec=SerialInterface)
+    mock_ser.baudrate = 115200
+    tester = LatencyTest(mock_ser)
+
+    class DummyBar:
+        def __init__(self, *_: Any, **__: Any) -> None: ...
+        def __enter__(self) -> Any:
+            return lambda: None
+
+        def __exit__(self, *_: object) -> None:
+            return None
+
+    # Simulated clock: every read costs 10 us, publishing costs 250 ms.
+    now = {"t": 0.0}
+    send_times: list[float] = []
+    sleeps: list[float] = []
+
+    def fake_clock() -> float:
+        now["t"] += 1e-5
+        return now["t"]
+
+    def fake_sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+        now["t"] += seconds
+
+    def fake_publish(*_: object) -> None:
+        send_times.append(now["t"])
+        now["t"] += 0.25
+
+    with (
+        patch("latency_test.alive_bar", DummyBar),
+        patch("latency_test.time.sleep", fake_sleep),
+        patch("latency_test.time.perf_counter", fake_clock),
+        patch.object(tester, "publish", fake_publish),
+        patch.object(tester, "_request_status_snapshot", return_value={}),
+        patch.object(tester, "_calculate_status_delta", return_value={}),
+        patch("latency_test.ResultStream"),
+    ):
+        tester.main_test(
+            num_times=2,
+            samples=4,
+            min_wait=1.0,
+            max_wait=1.0,
+            wait_time=0.0,
+            jitter=False,
+            length=6,
+            pipeline_depth=pipeline_depth,
+        )
+
+    # Pipelined sends go out back-to-back, then pacing resumes on the grid.
+    for burst in (send_times[:4], send_times[4:]):
+        offsets = [t - burst[0] for t in burst]
+        assert offsets == pytest.approx(expected_offsets, abs=1e-3)
+    # The coarse sleep leaves the spin margin and the publish time unslept.
+    assert max(sleeps) <= 1.0 - 0.25 - SLEEP_SPIN_MARGIN_S
+
 
 # ---------------------------------------------------------------------------
 # Mutation-testing coverage improvements
@@ -521,8 +585,14 @@ def test_execute_test_keyboard_interrupt() -> None:
         tester.execute_test()
 
 
-def test_main_test_nonzero_wait_values() -> None:
-    """main_test with non-zero min/max wait exercises the interpolation formula."""
+@pytest.mark.parametrize(
+    ("num_times", "expected_waits"),
+    [(1, [0.01]), (2, [0.01, 0.05]), (3, [0.01, 0.03, 0.05])],
+)
+def test_main_test_nonzero_wait_values(
+    num_times: int, expected_waits: list[float]
+) -> None:
+    """Burst waits ramp linearly from min_wait to max_wait."""
     mock_ser = Mock(spec=SerialInterface)
     mock_ser.baudrate = 115200
     tester = LatencyTest(mock_ser)
@@ -541,21 +611,16 @@ def test_main_test_nonzero_wait_values() -> None:
         t["v"] += 0.01
         return t["v"]
 
-    captured: dict[str, Any] = {}
-
-    def fake_write(file_path: Path, output_data: list[dict[str, Any]]) -> None:
-        captured["data"] = output_data
-
     with (
         patch("latency_test.alive_bar", DummyBar),
         patch("latency_test.time.sleep", lambda _x: None),
         patch("latency_test.time.perf_counter", side_effect=fake_perf_counter),
         patch("base_test.time.perf_counter", side_effect=fake_perf_counter),
         patch("base_test.time.sleep", lambda _x: None),
-        patch.object(LatencyTest, "_write_output_to_file", side_effect=fake_write),
+        patch("latency_test.ResultStream") as mock_stream,
     ):
         tester.main_test(
-            num_times=2,
+            num_times=num_times,
             samples=2,
             min_wait=0.01,
             max_wait=0.05,
@@ -564,11 +629,7 @@ def test_main_test_nonzero_wait_values() -> None:
             length=6,
         )
 
-    assert "data" in captured
-    out = captured["data"]
-    assert len(out) == 2
-    # The two test runs should have different waiting_time values
-    # due to the interpolation formula: min_wait + (max_wait - min_wait) * (j / (num_times - 1))
-    wait_0 = out[0]["waiting_time"]
-    wait_1 = out[1]["waiting_time"]
-    assert wait_0 != pytest.approx(wait_1, abs=1e-9)
+    results = mock_stream.return_value.__enter__.return_value
+    out = [c.args[0] for c in results.append.call_args_list]
+    # A single burst uses min_wait instead of dividing by num_times - 1.
+    assert [item["waiting_time"] for item in out] == pytest.approx(expected_waits)
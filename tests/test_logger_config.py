@@ -5,13 +5,19 @@ from __future__ import annotations
 import logging
 import logging.handlers
 import os
+import queue
 import time
 from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 
-from logger_config import _Dispatch, _install_queue_dispatch, setup_logging
+from logger_config import (
+    _DeferredFormatQueueHandler,
+    _Dispatch,
+    _install_queue_dispatch,
+    setup_logging,
+)
 
 
 class TestSetupLogging:
@@ -186,3 +192,32 @@ class TestQueueDispatch:
         assert second_listener is not None
         # The second call is a no-op: no real handlers left to collect.
         assert first_listener is second_listener
+
+
+class TestDeferredFormatQueueHandler:
+    """Records are queued unformatted only when that is safe."""
+
+    @staticmethod
+    def _record(msg: str, args: tuple[object, ...]) -> logging.LogRecord:
+        return logging.LogRecord("t", logging.INFO, __file__, 1, msg, args, None)
+
+    def test_immutable_args_are_left_unformatted(self) -> None:
+        handler = _DeferredFormatQueueHandler(queue.SimpleQueue())
+        record = self._record("frame %s len %d", (b"\x01\x02", 2))
+
+        prepared = handler.prepare(record)
+
+        assert prepared is record
+        assert prepared.args == (b"\x01\x02", 2)
+        assert prepared.getMessage() == "frame b'\\x01\\x02' len 2"
+
+    def test_mutable_args_are_formatted_on_the_caller(self) -> None:
+        handler = _DeferredFormatQueueHandler(queue.SimpleQueue())
+        buffer = bytearray(b"\x01")
+        record = self._record("frame %s", (buffer,))
+
+        prepared = handler.prepare(record)
+        buffer[0] = 0xFF
+
+        assert prepared.args is None
+        assert prepared.getMessage() == "frame bytearray(b'\\x01')"
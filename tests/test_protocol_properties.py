@@ -21,15 +21,15 @@ def test_checksum_matches_bitwise_xor_property(data: bytes) -> None:
     for byte in data:
         expected ^= byte
 
-    assert calculate_checksum(data) == bytes([expected])
+    assert calculate_checksum(data) == expected
 
 
 @given(st.binary(), st.binary())
 def test_checksum_xor_composition_property(left: bytes, right: bytes) -> None:
     """checksum(A + B) equals checksum(A) XOR checksum(B)."""
-    chk_left = calculate_checksum(left)[0]
-    chk_right = calculate_checksum(right)[0]
-    chk_concat = calculate_checksum(left + right)[0]
+    chk_left = calculate_checksum(left)
+    chk_right = calculate_checksum(right)
+    chk_concat = calculate_checksum(left + right)
 
     assert chk_concat == (chk_left ^ chk_right)
 
@@ -48,7 +48,7 @@ def test_write_frame_roundtrip_property(payload: bytes) -> None:
 
     assert framed.endswith(b"\x00")
     decoded = cobs.decode(framed[:-1])
-    assert decoded == payload + calculate_checksum(payload)
+    assert decoded == payload + bytes([calculate_checksum(payload)])
 
 
 @given(st.binary(min_size=1, max_size=256))
@@ -90,3 +90,45 @@ def test_handle_received_data_ignores_empty_frames_property(
     with pytest.raises(queue.Empty):
         # Queue should now be empty: the extra delimiter must not create a packet.
         si.message_queue.get(timeout=0.01)
+
+
+def _reference_frames(wire_data: bytes, max_message_size: int) -> list[bytes]:
+    """Frame a byte stream one byte at a time, clearing on every overflow."""
+    frames: list[bytes] = []
+    buffer = bytearray()
+    for byte in wire_data:
+        if byte == 0:
+            if buffer:
+                frames.append(bytes(buffer))
+                buffer.clear()
+        else:
+            buffer.append(byte)
+            if len(buffer) > max_message_size:
+                buffer.clear()
+    return frames
+
+
+@given(
+    st.binary(max_size=256),
+    st.lists(st.integers(min_value=1, max_value=64), min_size=1),
+    st.integers(min_value=1, max_value=32),
+)
+def test_handle_received_data_chunking_matches_bytewise_property(
+    wire_data: bytes, chunk_sizes: list[int], max_message_size: int
+) -> None:
+    """Any split of the stream into reads must queue the byte-by-byte frames."""
+    si = SerialInterface("COM1", 115200, 0.1)
+    si.ser = Mock()
+
+    offset = 0
+    index = 0
+    while offset < len(wire_data):
+        size = chunk_sizes[index % len(chunk_sizes)]
+        si._handle_received_data(wire_data[offset : offset + size], max_message_size)
+        offset += size
+        index += 1
+
+    queued = []
+    while not si.message_queue.empty():
+        queued.append(si.message_queue.get_nowait())
+    assert queued == _reference_frames(wire_data, max_message_size)
@@ -3,8 +3,11 @@
 from __future__ import annotations
 
 import re
+from typing import TYPE_CHECKING
 from unittest.mock import patch
 
+import pytest
+
 from result_format import (
     FORMAT_LATENCY_SERIES,
     FORMAT_STRESS_RUN,
@@ -12,8 +15,12 @@ from result_format import (
     make_result_envelope,
     make_result_filename,
     parse_result_envelope,
+    write_text_atomic,
 )
 
+if TYPE_CHECKING:
+    from pathlib import Path
+
 # ---------------------------------------------------------------------------
 # make_result_envelope
 # ---------------------------------------------------------------------------
@@ -79,11 +86,36 @@ class TestMakeResultFilename:
 
     def test_timestamp_is_utc(self) -> None:
         """Verify the timestamp portion comes from a controlled clock."""
-        import datetime
+        import calendar
+        import time
 
-        fixed = datetime.datetime(2025, 3, 15, 10, 30, 45, tzinfo=datetime.UTC)
-        with patch("result_format.datetime.datetime") as mock_dt:
-            mock_dt.now.return_value = fixed
-            mock_dt.UTC = datetime.UTC
+        fixed = calendar.timegm((2025, 3, 15, 10, 30, 45, 0, 0, 0))
+        with patch("result_format.time.gmtime", return_value=time.gmtime(fixed)):
             name = make_result_filename("latency", "aabbccdd")
         assert name.startswith("20250315-103045-")
+
+
+# ---------------------------------------------------------------------------
+# write_text_atomic
+# ---------------------------------------------------------------------------
+
+
+class TestWriteTextAtomic:
+    def test_writes_content_without_leftovers(self, tmp_path: Path) -> None:
+        """The target holds the content and no temporary file remains."""
+        target = tmp_path / "result.json"
+        write_text_atomic(target, '{"a": 1}')
+        assert target.read_text(encoding="utf-8") == '{"a": 1}'
+        assert [p.name for p in tmp_path.iterdir()] == ["result.json"]
+
+    def test_failed_write_keeps_previous_file(self, tmp_path: Path) -> None:
+        """A failure mid-write leaves the old file intact and cleans up."""
+        target = tmp_path / "result.json"
+        target.write_text("old", encoding="utf-8")
+        with (
+            patch("result_format.os.fsync", side_effect=OSError("disk full")),
+            pytest.raises(OSError, match="disk full"),
+        ):
+            write_text_atomic(target, "new")
+        assert target.read_text(encoding="utf-8") == "old"
+        assert [p.name for p in tmp_path.iterdir()] == ["result.json"]
@@ -3,8 +3,9 @@
 from __future__ import annotations
 
 import logging
+import threading
 from typing import TYPE_CHECKING, Any
-from unittest.mock import Mock, patch
+from unittest.mock import Mock, call, patch
 
 import serial
 from cobs import cobs
@@ -130,6 +131,29 @@ def test_write_index_error_logs(caplog: pytest.LogCaptureFixture) -> None:
         si.write(b"\x00")  # too short to index data[1]
         logger.removeHandler(caplog.handler)
     assert "Error processing message to send" in caplog.text
+    ser_mock.write.assert_not_called()
+
+
+def test_write_from_threads_counts_every_frame() -> None:
+    """Concurrent writers each get their frame written and counted."""
+    si = make_interface()
+    ser_mock = Mock()
+    ser_mock.write.side_effect = len
+    si.ser = ser_mock
+
+    payload = b"\x00" + bytes([SerialCommand.ECHO_COMMAND.value]) + b"abc"
+    writers = [
+        threading.Thread(target=lambda: [si.write(payload) for _ in range(100)])
+        for _ in range(4)
+    ]
+    for writer in writers:
+        writer.start()
+    for writer in writers:
+        writer.join()
+
+    assert ser_mock.write.call_count == 400
+    assert si.statistics.commands_sent[SerialCommand.ECHO_COMMAND.value] == 400
+    assert si.statistics.bytes_sent == 400 * len(ser_mock.write.call_args.args[0])
 
 
 def test_process_complete_message_success_calls_handler() -> None:
@@ -248,6 +272,23 @@ def test_close_joins_threads_and_closes_ser() -> None:
     ser_mock.close.assert_called_once()
 
 
+def test_close_cancels_pending_read_before_join() -> None:
+    """close() wakes a read blocked on the port timeout before joining."""
+    si = make_interface()
+    manager = Mock()
+    si.read_thread = manager.read_thread
+    si.processing_thread = Mock()
+    si.ser = manager.ser
+    manager.ser.cancel_read.side_effect = OSError("port already closed")
+
+    si.close()
+
+    assert manager.mock_calls[:2] == [
+        call.ser.cancel_read(),
+        call.read_thread.join(),
+    ]
+
+
 def test_set_baudrate_success() -> None:
     """set_baudrate closes, reopens at new rate, and restarts threads."""
     si = make_interface()
@@ -386,7 +427,7 @@ class TestWriteEncoding:
 
         # Expected checksum: XOR of all bytes in data
         expected_checksum = calculate_checksum(data)
-        payload_with_checksum = data + expected_checksum
+        payload_with_checksum = data + bytes([expected_checksum])
         expected_message = cobs.encode(payload_with_checksum) + b"\x00"
 
         ser_mock.write.assert_called_once_with(expected_message)
@@ -395,11 +436,27 @@ class TestWriteEncoding:
         actual_message = ser_mock.write.call_args[0][0]
         assert actual_message[-1:] == b"\x00"
 
+    def test_write_reuses_encoded_frame(self) -> None:
+        """Writing the same payload twice encodes it only once."""
+        si = make_interface()
+        ser_mock = Mock()
+        ser_mock.write.side_effect = len
+        si.ser = ser_mock
+
+        data = bytearray(b"\x00" + bytes([SerialCommand.ECHO_COMMAND.value]) + b"xyz")
+        with patch("serial_interface.cobs.encode", wraps=cobs.encode) as mock_encode:
+            si.write(data)
+            si.write(data)
+
+        mock_encode.assert_called_once()
+        first, second = (c.args[0] for c in ser_mock.write.call_args_list)
+        assert first == second
+
     def test_write_checksum_byte_is_correct(self) -> None:
         """Verify the checksum byte is the XOR of all data bytes."""
         data = b"\x10\x14\x01\x02"
         expected = 0x10 ^ 0x14 ^ 0x01 ^ 0x02
-        assert calculate_checksum(data) == bytes([expected])
+        assert calculate_checksum(data) == expected
 
 
 class TestFlush:
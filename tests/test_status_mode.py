@@ -457,7 +457,7 @@ def test_base_test_snapshot_includes_heap() -> None:
         patch("base_test.time.sleep", return_value=None),
         patch(
             "base_test.time.perf_counter",
-            side_effect=[100.0, 100.0, 200.0, 200.0],
+            side_effect=[100.0, 200.0, 200.0],
         ),
     ):
         result = bt._request_status_snapshot(timeout_s=1.0)
@@ -6,6 +6,8 @@ All tests are hardware-free — no SerialInterface dependency.
 
 from __future__ import annotations
 
+from unittest.mock import patch
+
 import pytest
 
 from stress_config import ScenarioConfig, ScenarioThresholds
@@ -85,6 +87,20 @@ class TestComputeLatencyStats:
         assert p95 == pytest.approx(95.05, abs=1.0)
         assert p99 == pytest.approx(99.01, abs=1.0)
 
+    def test_matches_per_percentile_helper(self) -> None:
+        values = [7.5, 1.0, 3.25, 9.0, 2.0, 6.0, 4.5]
+        assert compute_latency_stats(values) == (
+            _percentile(values, 50),
+            _percentile(values, 95),
+            _percentile(values, 99),
+        )
+
+    def test_sorts_input_once(self) -> None:
+        values = [float(v) for v in range(20, 0, -1)]
+        with patch("stress_evaluator.sorted", create=True, wraps=sorted) as spy:
+            compute_latency_stats(values)
+        spy.assert_called_once()
+
 
 # ---------------------------------------------------------------------------
 # evaluate_verdict — PASS cases
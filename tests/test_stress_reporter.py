@@ -5,6 +5,7 @@ from __future__ import annotations
 import json
 import re
 from pathlib import Path
+from unittest.mock import mock_open, patch
 
 import pytest
 
@@ -125,6 +126,20 @@ class TestWriteJsonReport:
             data = json.load(f)
         assert data["payload"]["overall_verdict"] == "FAIL"
 
+    def test_report_written_in_single_call(self, tmp_path: Path) -> None:
+        result = _run_result()
+        m = mock_open()
+        with (
+            patch("pathlib.Path.open", m),
+            patch("result_format.os.fsync"),
+            patch("pathlib.Path.replace"),
+        ):
+            write_json_report(result, output_dir=str(tmp_path))
+        handle = m()
+        handle.write.assert_called_once()
+        data = json.loads(handle.write.call_args.args[0])
+        assert data["payload"]["run_id"] == result.run_id
+
 
 # ---------------------------------------------------------------------------
 # print_summary